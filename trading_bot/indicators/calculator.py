@@ -1,5 +1,6 @@
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from collections import deque
 
 # Helper function for Exponential Moving Average (EMA)
@@ -149,8 +150,12 @@ def calculate_supertrend(high_prices_series, low_prices_series, close_prices_ser
     upper_band = hl2 + (atr_multiplier * atr)
     lower_band = hl2 - (atr_multiplier * atr)
 
-    supertrend = pd.Series(index=close_prices_series.index, dtype=float)
-    direction = pd.Series(index=close_prices_series.index, dtype=int) # 1 for uptrend, -1 for downtrend
+    # Plain ndarrays for the recursive loop; label/iloc lookups on Series cost dozens of calls each
+    closes = close_prices_series.to_numpy(dtype=float)
+    upper = upper_band.to_numpy(dtype=float)
+    lower = lower_band.to_numpy(dtype=float)
+    st_values = np.full(len(closes), np.nan)
+    dir_values = np.full(len(closes), np.nan) # 1 for uptrend, -1 for downtrend
 
     # Initial state: Assume downtrend for the first valid ATR point if close is below upper_band, else uptrend.
     # This initialization can vary. A common way is to wait for a clear cross.
@@ -159,40 +164,41 @@ def calculate_supertrend(high_prices_series, low_prices_series, close_prices_ser
     first_valid_atr_index = atr.first_valid_index()
     if first_valid_atr_index is None:
         return None # Should not happen if atr is not None/empty
+    start = atr.index.get_loc(first_valid_atr_index)
 
     # Iterate from the first point where ATR is valid
     # Initialize first Supertrend value
-    if close_prices_series[first_valid_atr_index] <= upper_band[first_valid_atr_index]:
-        supertrend[first_valid_atr_index] = upper_band[first_valid_atr_index]
-        direction[first_valid_atr_index] = -1 # Downtrend
+    if closes[start] <= upper[start]:
+        st_values[start] = upper[start]
+        dir_values[start] = -1 # Downtrend
     else:
-        supertrend[first_valid_atr_index] = lower_band[first_valid_atr_index]
-        direction[first_valid_atr_index] = 1 # Uptrend
+        st_values[start] = lower[start]
+        dir_values[start] = 1 # Uptrend
 
-    for i in range(first_valid_atr_index + 1, len(close_prices_series)):
-        current_close = close_prices_series[i]
-        prev_close = close_prices_series[i-1]
-        prev_supertrend = supertrend[i-1]
-        prev_direction = direction[i-1]
+    for i in range(start + 1, len(closes)):
+        current_close = closes[i]
+        prev_supertrend = st_values[i-1]
+        prev_direction = dir_values[i-1]
 
         if prev_direction == 1: # Previous was Uptrend
-            supertrend[i] = lower_band[i]
-            if current_close < lower_band[i]: # Price crossed below lower band
-                direction[i] = -1 # Change to Downtrend
-                supertrend[i] = upper_band[i] # Switch band
+            if current_close < lower[i]: # Price crossed below lower band
+                dir_values[i] = -1 # Change to Downtrend
+                st_values[i] = upper[i] # Switch band
             else:
-                direction[i] = 1 # Continue Uptrend
+                dir_values[i] = 1 # Continue Uptrend
                 # Adjust band: if current lower_band is higher than previous, use it
-                supertrend[i] = max(lower_band[i], prev_supertrend)
+                st_values[i] = max(lower[i], prev_supertrend)
         else: # Previous was Downtrend
-            supertrend[i] = upper_band[i]
-            if current_close > upper_band[i]: # Price crossed above upper band
-                direction[i] = 1 # Change to Uptrend
-                supertrend[i] = lower_band[i] # Switch band
+            if current_close > upper[i]: # Price crossed above upper band
+                dir_values[i] = 1 # Change to Uptrend
+                st_values[i] = lower[i] # Switch band
             else:
-                direction[i] = -1 # Continue Downtrend
+                dir_values[i] = -1 # Continue Downtrend
                 # Adjust band: if current upper_band is lower than previous, use it
-                supertrend[i] = min(upper_band[i], prev_supertrend)
+                st_values[i] = min(upper[i], prev_supertrend)
+
+    supertrend = pd.Series(st_values, index=close_prices_series.index)
+    direction = pd.Series(dir_values, index=close_prices_series.index)
 
     if supertrend.empty or supertrend.isna().all(): # check if all values are NaN
         return None
@@ -323,8 +329,11 @@ def calculate_sar(high_prices_series, low_prices_series, initial_af=0.02, max_af
     if len(high_prices_series) < 2: # Need at least 2 points to determine initial trend
         return None
 
-    sar_values = pd.Series(index=high_prices_series.index, dtype=float)
-    direction_values = pd.Series(index=high_prices_series.index, dtype=int) # 1 for long, -1 for short
+    # Plain ndarrays for the recursive loop; .iloc costs dozens of Python calls per access
+    highs = high_prices_series.to_numpy(dtype=float)
+    lows = low_prices_series.to_numpy(dtype=float)
+    sar_arr = np.empty(len(highs))
+    direction_arr = np.empty(len(highs)) # 1 for long, -1 for short
 
     # Initial SAR:
     # First SAR is typically the previous Low if trend is up, or previous High if trend is down.
@@ -338,49 +347,52 @@ def calculate_sar(high_prices_series, low_prices_series, initial_af=0.02, max_af
     # Start with SAR at the first low, assuming an uptrend.
     # If the next period reverses, it will flip. This is a common approach.
 
-    sar_values.iloc[0] = low_prices_series.iloc[0]
+    sar_arr[0] = lows[0]
     is_long_trend = True # Initial assumption
-    direction_values.iloc[0] = 1
+    direction_arr[0] = 1
     af = initial_af
-    ep = high_prices_series.iloc[0] # Extreme Point
+    ep = highs[0] # Extreme Point
 
-    for i in range(1, len(high_prices_series)):
-        prev_sar = sar_values.iloc[i-1]
+    for i in range(1, len(highs)):
+        prev_sar = sar_arr[i-1]
 
         if is_long_trend:
             current_sar = prev_sar + af * (ep - prev_sar)
             # Ensure SAR does not move into the prior period's low or current period's low
-            current_sar = min(current_sar, low_prices_series.iloc[i-1], low_prices_series.iloc[i])
+            current_sar = min(current_sar, lows[i-1], lows[i])
 
-            if low_prices_series.iloc[i] < current_sar: # Trend reversal to short
+            if lows[i] < current_sar: # Trend reversal to short
                 is_long_trend = False
-                direction_values.iloc[i] = -1
+                direction_arr[i] = -1
                 current_sar = ep # SAR becomes the prior EP (which was a high)
-                ep = low_prices_series.iloc[i] # New EP is current low
+                ep = lows[i] # New EP is current low
                 af = initial_af
             else: # Continue long trend
-                direction_values.iloc[i] = 1
-                if high_prices_series.iloc[i] > ep: # New extreme high
-                    ep = high_prices_series.iloc[i]
+                direction_arr[i] = 1
+                if highs[i] > ep: # New extreme high
+                    ep = highs[i]
                     af = min(af + af_increment, max_af)
         else: # Short trend
             current_sar = prev_sar - af * (prev_sar - ep)
             # Ensure SAR does not move into the prior period's high or current period's high
-            current_sar = max(current_sar, high_prices_series.iloc[i-1], high_prices_series.iloc[i])
+            current_sar = max(current_sar, highs[i-1], highs[i])
 
-            if high_prices_series.iloc[i] > current_sar: # Trend reversal to long
+            if highs[i] > current_sar: # Trend reversal to long
                 is_long_trend = True
-                direction_values.iloc[i] = 1
+                direction_arr[i] = 1
                 current_sar = ep # SAR becomes the prior EP (which was a low)
-                ep = high_prices_series.iloc[i] # New EP is current high
+                ep = highs[i] # New EP is current high
                 af = initial_af
             else: # Continue short trend
-                direction_values.iloc[i] = -1
-                if low_prices_series.iloc[i] < ep: # New extreme low
-                    ep = low_prices_series.iloc[i]
+                direction_arr[i] = -1
+                if lows[i] < ep: # New extreme low
+                    ep = lows[i]
                     af = min(af + af_increment, max_af)
 
-        sar_values.iloc[i] = current_sar
+        sar_arr[i] = current_sar
+
+    sar_values = pd.Series(sar_arr, index=high_prices_series.index)
+    direction_values = pd.Series(direction_arr, index=high_prices_series.index)
 
     if sar_values.empty or sar_values.isna().all():
         return None
@@ -399,73 +411,60 @@ def calculate_williams_fractal(high_prices_series, low_prices_series, window=5):
     A bullish fractal: Low[i] < Low[i-1] and Low[i] < Low[i-2] and Low[i] < Low[i+1] and Low[i] < Low[i+2]
     The standard window is 5 bars (middle bar is the fractal, with 2 bars on each side).
 
-    Expects pandas Series for high and low prices.
-    Returns a dictionary {'bullish': Series (boolean), 'bearish': Series (boolean),
+    Accepts pandas Series, NumPy arrays or lists for high and low prices.
+    Returns a dictionary {'bullish': mask, 'bearish': mask,
                          'last_bullish_price': float/None, 'last_bearish_price': float/None} or None.
-    The boolean series are True where a fractal is confirmed.
+    The boolean masks are True where a fractal is confirmed; they are pandas Series aligned to the
+    input when Series are passed, plain NumPy arrays otherwise.
     Note: Fractals are lagging; a fractal at index `i` is confirmed at index `i + (window//2)`.
     This implementation identifies the fractal point at index `i` based on surrounding data.
     For real-time, one would typically look for fractals that formed `window//2` bars ago.
     """
-    if not (isinstance(high_prices_series, pd.Series) and
-            isinstance(low_prices_series, pd.Series)):
-        try:
-            high_prices_series = pd.Series(high_prices_series, dtype=float)
-            low_prices_series = pd.Series(low_prices_series, dtype=float)
-        except ValueError:
-            raise ValueError("Inputs (high, low) must be pandas Series or convertible to them.")
+    try:
+        highs = np.asarray(high_prices_series, dtype=float)
+        lows = np.asarray(low_prices_series, dtype=float)
+    except ValueError:
+        raise ValueError("Inputs (high, low) must be pandas Series or convertible to them.")
 
-    if not (len(high_prices_series) == len(low_prices_series)):
+    if not (len(highs) == len(lows)):
         raise ValueError("Input high and low price series must have the same length.")
 
-    if len(high_prices_series) < window:
+    if len(highs) < window:
         return None # Not enough data for a full window comparison
 
     n = window // 2 # Number of bars on each side of the potential fractal
 
-    bearish_fractals = pd.Series(index=high_prices_series.index, dtype=bool)
-    bullish_fractals = pd.Series(index=low_prices_series.index, dtype=bool)
-
-    for i in range(n, len(high_prices_series) - n):
-        # Bearish Fractal Check
-        is_bearish = True
-        for j in range(1, n + 1):
-            if not (high_prices_series.iloc[i] > high_prices_series.iloc[i-j] and \
-                    high_prices_series.iloc[i] > high_prices_series.iloc[i+j]):
-                is_bearish = False
-                break
-        bearish_fractals.iloc[i] = is_bearish
-
-        # Bullish Fractal Check
-        is_bullish = True
-        for j in range(1, n + 1):
-            if not (low_prices_series.iloc[i] < low_prices_series.iloc[i-j] and \
-                    low_prices_series.iloc[i] < low_prices_series.iloc[i+j]):
-                is_bullish = False
-                break
-        bullish_fractals.iloc[i] = is_bullish
-
-    # Get the price of the last identified fractals
-    last_bearish_fractal_price = None
-    if bearish_fractals.any():
-        # Get the high price at the location of the last True bearish fractal
-        # Ensure index exists before accessing
-        true_bearish_indices = bearish_fractals[bearish_fractals].index
-        if not true_bearish_indices.empty:
-            last_bearish_index = true_bearish_indices[-1]
-            last_bearish_fractal_price = high_prices_series.get(last_bearish_index) # use .get for safety
-
-    last_bullish_fractal_price = None
-    if bullish_fractals.any():
-        # Get the low price at the location of the last True bullish fractal
-        true_bullish_indices = bullish_fractals[bullish_fractals].index
-        if not true_bullish_indices.empty:
-            last_bullish_index = true_bullish_indices[-1]
-            last_bullish_fractal_price = low_prices_series.get(last_bullish_index) # use .get for safety
+    # Bars within `n` of either end cannot be checked and stay flagged, as in a boolean
+    # pd.Series(index=..., dtype=bool), which starts out all True.
+    is_bearish_arr = np.ones(len(highs), dtype=bool)
+    is_bullish_arr = np.ones(len(lows), dtype=bool)
+    # A bar is a fractal when it beats the extreme of the `n` bars on its left and of the `n`
+    # bars on its right. Both side extremes come from one rolling max/min over width-n windows:
+    # window k covers bars k..k+n-1, so bar i's left side is window i-n and its right side is i+1.
+    if n > 0: # With n == 0 there are no neighbours to beat and every bar qualifies
+        high_side_max = sliding_window_view(highs, n).max(axis=1)
+        low_side_min = sliding_window_view(lows, n).min(axis=1)
+        center = slice(n, len(highs) - n)
+        left = slice(0, len(highs) - 2 * n)
+        right = slice(n + 1, len(highs) - n + 1)
+        is_bearish_arr[center] = (highs[center] > high_side_max[left]) & (highs[center] > high_side_max[right])
+        is_bullish_arr[center] = (lows[center] < low_side_min[left]) & (lows[center] < low_side_min[right])
+
+    # Price of the last identified fractals
+    bearish_positions = np.flatnonzero(is_bearish_arr)
+    last_bearish_fractal_price = highs[bearish_positions[-1]] if len(bearish_positions) else None
+    bullish_positions = np.flatnonzero(is_bullish_arr)
+    last_bullish_fractal_price = lows[bullish_positions[-1]] if len(bullish_positions) else None
+
+    bearish_fractals, bullish_fractals = is_bearish_arr, is_bullish_arr
+    if isinstance(high_prices_series, pd.Series):
+        bearish_fractals = pd.Series(is_bearish_arr, index=high_prices_series.index)
+    if isinstance(low_prices_series, pd.Series):
+        bullish_fractals = pd.Series(is_bullish_arr, index=low_prices_series.index)
 
     return {
-        'bearish': bearish_fractals, # Full series
-        'bullish': bullish_fractals, # Full series
+        'bearish': bearish_fractals, # Full mask
+        'bullish': bullish_fractals, # Full mask
         'last_bearish_price': last_bearish_fractal_price,
         'last_bullish_price': last_bullish_fractal_price
     }
@@ -475,24 +474,201 @@ def calculate_momentum(prices_series, period=10):
     """
     Calculates Momentum.
     Momentum = Current Price - Price N periods ago.
-    Expects a pandas Series of prices.
+    Accepts a pandas Series, NumPy array or list of prices.
     Returns the latest momentum value or None if not enough data.
     """
-    if not isinstance(prices_series, pd.Series):
-        try:
-            prices_series = pd.Series(prices_series, dtype=float)
-        except ValueError:
-            raise ValueError("Input prices_series must be a pandas Series or convertible to one.")
+    try:
+        prices = np.asarray(prices_series, dtype=float)
+    except ValueError:
+        raise ValueError("Input prices_series must be a pandas Series or convertible to one.")
+
+    if len(prices) <= period: # Needs more than `period` data points for the first calculation
+        return None
+
+    # Only the last value is reported, so skip the full diff(period) series
+    momentum = prices[-1] - prices[-1 - period]
+
+    if np.isnan(momentum):
+        return None
+
+    return momentum
+
+# --- Incremental (per-bar) updates ---
+# init_*_state() returns the running state of one recursive indicator and update_*() folds a single new
+# bar into it in O(1), returning what the matching calculate_* reports for its last bar.
+# Feeding a series bar by bar into a fresh state reproduces calculate_* over that same series.
+
+def init_macd_state():
+    return {'count': 0, 'ema_short': None, 'ema_long': None, 'ema_signal': None}
+
+def update_macd(state, close, short_period=12, long_period=26, signal_period=9):
+    """Folds one close into the MACD EMAs. Returns the calculate_macd() dict, or None if not enough data."""
+    state['count'] += 1
+    if state['ema_short'] is None:
+        state['ema_short'] = state['ema_long'] = close
+        state['ema_signal'] = 0.0 # First MACD value is always 0
+    else:
+        alpha_short = 2.0 / (short_period + 1)
+        alpha_long = 2.0 / (long_period + 1)
+        alpha_signal = 2.0 / (signal_period + 1)
+        state['ema_short'] = (1 - alpha_short) * state['ema_short'] + alpha_short * close
+        state['ema_long'] = (1 - alpha_long) * state['ema_long'] + alpha_long * close
+        macd_value = state['ema_short'] - state['ema_long']
+        state['ema_signal'] = (1 - alpha_signal) * state['ema_signal'] + alpha_signal * macd_value
+
+    if state['count'] < long_period:
+        return None
+    macd_value = state['ema_short'] - state['ema_long']
+    return {
+        'macd': macd_value,
+        'signal': state['ema_signal'],
+        'histogram': macd_value - state['ema_signal']
+    }
+
+def init_rsi_state():
+    return {'count': 0, 'prev_close': None, 'avg_gain': 0.0, 'avg_loss': 0.0}
 
-    if len(prices_series) <= period: # Needs more than `period` data points for the first calculation
+def update_rsi(state, close, period=14):
+    """Folds one close into Wilder's average gain/loss. Returns the RSI value or None if not enough data."""
+    state['count'] += 1
+    if state['prev_close'] is not None: # First bar has no delta: gain and loss stay 0
+        delta = close - state['prev_close']
+        alpha = 1.0 / period
+        state['avg_gain'] = (1 - alpha) * state['avg_gain'] + alpha * (delta if delta > 0 else 0.0)
+        state['avg_loss'] = (1 - alpha) * state['avg_loss'] + alpha * (-delta if delta < 0 else 0.0)
+    state['prev_close'] = close
+
+    if state['count'] <= period:
+        return None
+    if state['avg_loss'] == 0:
+        return 100.0
+    rs = state['avg_gain'] / state['avg_loss']
+    return 100.0 - (100.0 / (1.0 + rs))
+
+def init_atr_state():
+    return {'count': 0, 'prev_close': None, 'atr': None}
+
+def update_atr(state, high, low, close, period=14):
+    """Folds one bar's true range into Wilder's ATR. Returns the latest ATR value or None if not enough data."""
+    state['count'] += 1
+    true_range = high - low
+    if state['prev_close'] is not None:
+        true_range = max(true_range, abs(high - state['prev_close']), abs(low - state['prev_close']))
+    if state['atr'] is None:
+        state['atr'] = true_range
+    else:
+        alpha = 1.0 / period
+        state['atr'] = (1 - alpha) * state['atr'] + alpha * true_range
+    state['prev_close'] = close
+
+    if state['count'] < period:
+        return None
+    return state['atr']
+
+def init_supertrend_state():
+    return {'trend': None, 'direction': None}
+
+def update_supertrend(state, high, low, close, atr, atr_multiplier=3.0):
+    """
+    Advances the Supertrend by one bar, given that bar's ATR (from update_atr).
+    Returns {'last_trend': value, 'last_direction': value} or None while ATR is not available yet.
+    """
+    if atr is None:
+        return None
+
+    hl2 = (high + low) / 2
+    upper_band = hl2 + (atr_multiplier * atr)
+    lower_band = hl2 - (atr_multiplier * atr)
+
+    if state['direction'] is None: # First bar with a valid ATR, same initialization as calculate_supertrend
+        if close <= upper_band:
+            state['trend'], state['direction'] = upper_band, -1
+        else:
+            state['trend'], state['direction'] = lower_band, 1
+    elif state['direction'] == 1:
+        if close < lower_band:
+            state['trend'], state['direction'] = upper_band, -1
+        else:
+            state['trend'] = max(lower_band, state['trend'])
+    else:
+        if close > upper_band:
+            state['trend'], state['direction'] = lower_band, 1
+        else:
+            state['trend'] = min(upper_band, state['trend'])
+
+    return {'last_trend': state['trend'], 'last_direction': state['direction']}
+
+def init_kdj_state():
+    return {'count': 0, 'k': None, 'd': None}
+
+def update_kdj(state, high_window, low_window, close, n_period=9, m1_period=3, m2_period=3):
+    """
+    Folds one bar into the K and D smoothing. `high_window`/`low_window` are the highs/lows of the
+    last `n_period` bars including this one (fewer at the start of the series).
+    Returns {'K': value, 'D': value, 'J': value} or None if not enough data.
+    """
+    state['count'] += 1
+    rsv = 50.0 # Same neutral fill calculate_kdj uses for incomplete windows and HH == LL
+    if len(high_window) >= n_period:
+        lowest_low = min(low_window[-n_period:])
+        price_range = max(high_window[-n_period:]) - lowest_low
+        if price_range != 0:
+            rsv = (close - lowest_low) / price_range * 100
+
+    # K and D are kept unclipped so the smoothing matches the ewm chain in calculate_kdj
+    if state['k'] is None:
+        state['k'] = state['d'] = rsv
+    else:
+        alpha_k = 1.0 / m1_period
+        alpha_d = 1.0 / m2_period
+        state['k'] = (1 - alpha_k) * state['k'] + alpha_k * rsv
+        state['d'] = (1 - alpha_d) * state['d'] + alpha_d * state['k']
+
+    if state['count'] < n_period:
         return None
+    return {
+        'K': min(max(state['k'], 0.0), 100.0),
+        'D': min(max(state['d'], 0.0), 100.0),
+        'J': 3 * state['k'] - 2 * state['d']
+    }
 
-    momentum = prices_series.diff(period)
+def init_sar_state():
+    return {'count': 0, 'sar': None, 'is_long': True, 'af': None, 'ep': None, 'prev_high': None, 'prev_low': None}
 
-    if momentum.empty or pd.isna(momentum.iloc[-1]):
+def update_sar(state, high, low, initial_af=0.02, max_af=0.2, af_increment=0.02):
+    """Advances the Parabolic SAR by one bar. Returns {'last_sar': value, 'last_direction': value} or None if not enough data."""
+    state['count'] += 1
+    if state['sar'] is None: # Same start as calculate_sar: long, SAR at the first low
+        state['sar'], state['is_long'] = low, True
+        state['af'], state['ep'] = initial_af, high
+        state['prev_high'], state['prev_low'] = high, low
         return None
 
-    return momentum.iloc[-1]
+    prev_sar, af, ep = state['sar'], state['af'], state['ep']
+    if state['is_long']:
+        current_sar = min(prev_sar + af * (ep - prev_sar), state['prev_low'], low)
+        if low < current_sar: # Trend reversal to short
+            state['is_long'] = False
+            current_sar = ep
+            ep = low
+            af = initial_af
+        elif high > ep:
+            ep = high
+            af = min(af + af_increment, max_af)
+    else:
+        current_sar = max(prev_sar - af * (prev_sar - ep), state['prev_high'], high)
+        if high > current_sar: # Trend reversal to long
+            state['is_long'] = True
+            current_sar = ep
+            ep = high
+            af = initial_af
+        elif low < ep:
+            ep = low
+            af = min(af + af_increment, max_af)
+
+    state['sar'], state['af'], state['ep'] = current_sar, af, ep
+    state['prev_high'], state['prev_low'] = high, low
+    return {'last_sar': current_sar, 'last_direction': 1 if state['is_long'] else -1}
 
 if __name__ == '__main__':
     # Example Usage (for testing purposes)
@@ -136,9 +136,13 @@ class BotApplication:
                         self.schedule_gui_update(self.gui_app.update_status_bar)(
                             f"[MainApp] Processing {len(historical_klines)} historical '{settings.KLINE_FETCH_INTERVAL}' klines (detailed UI updates suppressed)..."
                         )
-                        for k_idx, k_data in enumerate(historical_klines):
-                            self.handle_new_kline_data(k_data)
-                            # Update GUI with the price of the current historical kline being processed
+                        # Replay in batches; the GUI gets the price and progress once per batch, not per kline
+                        batch_size = 250
+                        for batch_start in range(0, len(historical_klines), batch_size):
+                            batch = historical_klines[batch_start:batch_start + batch_size]
+                            processed_count = batch_start + self.strategy.process_batch(batch)
+                            # Update GUI with the price of the last historical kline processed
+                            k_data = batch[-1]
                             if k_data and 'c' in k_data: # Ensure k_data and 'c' key exist
                                 try:
                                     price_val = float(k_data['c'])
@@ -146,18 +150,17 @@ class BotApplication:
                                 except ValueError:
                                     logger.warning(f"[MainApp] Could not convert historical kline close price to float: {k_data.get('c')}")
 
-                            if (k_idx + 1) % 250 == 0 or (k_idx + 1) == len(historical_klines): # Update every 250 klines or on the last one
-                                 self.schedule_gui_update(self.gui_app.update_status_bar)(
-                                     f"[MainApp] Processed {k_idx+1}/{len(historical_klines)} historical '{settings.KLINE_FETCH_INTERVAL}' klines for aggregation..."
-                                 )
+                            self.schedule_gui_update(self.gui_app.update_status_bar)(
+                                f"[MainApp] Processed {processed_count}/{len(historical_klines)} historical '{settings.KLINE_FETCH_INTERVAL}' klines for aggregation..."
+                            )
 
                         self.strategy.is_historical_fill_active = False
                         # Perform one final update to GUI with the state after historical fill
-                        if self.strategy.agg_kline_data_deque: # If any aggregated bars were formed
+                        if self.strategy.agg_klines: # If any aggregated bars were formed
                             try:
                                 logger.info('[MainApp] Triggering final GUI update after historical fill.')
                                 # This call will now update GUI as flag is false
-                                self.strategy._run_strategy_on_aggregated_data()
+                                self.strategy._compute_and_emit()
                             except Exception as e_strat_call:
                                 logger.error(f'[MainApp] Error during final strategy call for GUI update: {e_strat_call}', exc_info=True)
                                 self.schedule_gui_update(self.gui_app.update_status_bar)(f'[MainApp] Error in final UI refresh: {e_strat_call}')
@@ -241,6 +244,8 @@ class BotApplication:
             else:
                 logger.info("Fetcher loop not available or not running for run_coroutine_threadsafe stop_all_streams.")
 
+        self.strategy.stop_signal_worker(timeout=2.0)
+
         if self.asyncio_thread and self.asyncio_thread.is_alive():
             logger.info("Waiting for asyncio_thread to finish...")
             self.asyncio_thread.join(timeout=5.0) # Wait for up to 5 seconds
@@ -1,93 +1,136 @@
-import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 import logging
+from collections import deque
+from itertools import islice
+
+from trading_bot.utils.kline_ring import KlineRing
 
 logger = logging.getLogger(__name__)
 
 # Standard Fibonacci levels
-RETRACEMENT_LEVELS = [0.0, 0.236, 0.382, 0.5, 0.618, 0.786, 1.0]
-EXTENSION_LEVELS_PRIMARY = [0, 0.382, 0.618, 1.0, 1.382, 1.618] # Based on AB swing
-EXTENSION_LEVELS_SECONDARY = [-0.618, -0.382, 0, 0.382, 0.618, 1.0, 1.382, 1.618, 2.0, 2.618] # Based on ABC, C is a retracement point
+RETRACEMENT_LEVELS = np.array([0.0, 0.236, 0.382, 0.5, 0.618, 0.786, 1.0], dtype=np.float64)
+EXTENSION_LEVELS_PRIMARY = np.array([0, 0.382, 0.618, 1.0, 1.382, 1.618], dtype=np.float64) # Based on AB swing
+EXTENSION_LEVELS_SECONDARY = np.array([-0.618, -0.382, 0, 0.382, 0.618, 1.0, 1.382, 1.618, 2.0, 2.618], dtype=np.float64) # Based on ABC, C is a retracement point
+# float32 copy for the batched K x levels multiply; the float64 arrays stay the exact level keys
+RETRACEMENT_LEVELS_F32 = RETRACEMENT_LEVELS.astype(np.float32)
 
-def find_significant_swings(prices_series, order=5):
+def find_significant_swings(prices, order=5, timestamps=None):
     """
     Finds significant swing high and low points.
     A simple approach: a swing high is higher than `order` bars on either side.
     A swing low is lower than `order` bars on either side.
     This is similar to Williams Fractal but more generalized for swings.
 
-    prices_series: pandas Series of prices (e.g., close, high, or low).
+    prices: 1-D array-like of prices (e.g., close, high, or low).
     order: number of bars on each side to check for significance.
-    Returns: list of tuples (index, price, type: 'high' or 'low')
-    """
-    if not isinstance(prices_series, pd.Series):
-        prices_series = pd.Series(prices_series)
-
-    if len(prices_series) < 2 * order + 1:
-        return []
-
-    swings = []
-    # Check for swing highs using high prices
-    for i in range(order, len(prices_series) - order):
-        is_swing_high = True
-        for j in range(1, order + 1):
-            if not (prices_series.iloc[i] >= prices_series.iloc[i-j] and \
-                    prices_series.iloc[i] >= prices_series.iloc[i+j]):
-                is_swing_high = False
-                break
-        if is_swing_high:
-            # Ensure it's higher than immediate neighbors to avoid flat tops being multiple swings
-            if not (prices_series.iloc[i] > prices_series.iloc[i-1] or prices_series.iloc[i] > prices_series.iloc[i+1]):
-                 # If part of a flat top, only take the first instance or a defined point
-                 # This simple check might still allow multiple points on perfectly flat tops.
-                 # A more robust way is to check if previous point was also a swing of same value.
-                 if i > order and prices_series.iloc[i] == prices_series.iloc[i-1] and any(s['index'] == prices_series.index[i-1] and s['type']=='high' for s in swings):
-                     continue # Skip if previous bar was same high swing
-            swings.append({'index': prices_series.index[i], 'price': prices_series.iloc[i], 'type': 'high'})
-
-    # Check for swing lows using low prices (can use same series or a dedicated low_prices_series)
-    for i in range(order, len(prices_series) - order):
-        is_swing_low = True
-        for j in range(1, order + 1):
-            if not (prices_series.iloc[i] <= prices_series.iloc[i-j] and \
-                    prices_series.iloc[i] <= prices_series.iloc[i+j]):
-                is_swing_low = False
-                break
-        if is_swing_low:
-            if not (prices_series.iloc[i] < prices_series.iloc[i-1] or prices_series.iloc[i] < prices_series.iloc[i+1]):
-                if i > order and prices_series.iloc[i] == prices_series.iloc[i-1] and any(s['index'] == prices_series.index[i-1] and s['type']=='low' for s in swings):
-                    continue
-            swings.append({'index': prices_series.index[i], 'price': prices_series.iloc[i], 'type': 'low'})
-
-    # Sort by index
-    swings.sort(key=lambda x: x['index'])
-
-    # Filter consecutive swings of the same type
-    if not swings: return []
-    filtered_swings = [swings[0]]
-    for i in range(1, len(swings)):
-        if swings[i]['type'] == filtered_swings[-1]['type']:
-            # Keep the more extreme one if same type consecutively
-            if swings[i]['type'] == 'high' and swings[i]['price'] > filtered_swings[-1]['price']:
-                filtered_swings[-1] = swings[i]
-            elif swings[i]['type'] == 'low' and swings[i]['price'] < filtered_swings[-1]['price']:
-                filtered_swings[-1] = swings[i]
-        else:
-            filtered_swings.append(swings[i])
+    timestamps: optional array aligned with prices; used as each swing's 'index'
+                (positions are used when omitted).
+    Returns: list of dicts {'index', 'price', 'type': 'high' or 'low'}
+    """
+    p = np.asarray(prices, dtype=np.float64)
+    ts = np.arange(len(p)) if timestamps is None else np.asarray(timestamps)
+    pos, price, is_high = _find_swing_arrays(p, order)
+    return [_swing_dict(ts, pos[k], price[k], is_high[k]) for k in range(len(pos))]
+
+
+def _find_swing_arrays(p, order):
+    """
+    Core of find_significant_swings on a float64 ndarray.
+    Returns the alternating swings as parallel arrays (positions, prices, is_high).
+    """
+    hi_pos, lo_pos = _swing_positions(p, order)
+    pos = np.concatenate((hi_pos, lo_pos))
+    is_high = np.concatenate((np.ones(len(hi_pos), dtype=bool), np.zeros(len(lo_pos), dtype=bool)))
+    return _merge_swings(pos, p[pos], is_high)
+
+
+def _swing_positions(p, order):
+    """ Positions of the swing highs and of the swing lows of `p`, before merging: (hi_pos, lo_pos). """
+    if len(p) < 2 * order + 1:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+
+    # One window view feeds both masks, so each window is read once while it is still in cache.
+    # A bar is a swing high when it equals the max of its 2*order+1 window (i.e. >= every
+    # bar `order` to either side), and a swing low when it equals the window min.
+    windows = sliding_window_view(p, 2 * order + 1)
+    center = p[order:len(p) - order]
+    hi_mask = center == windows.max(axis=1)
+    lo_mask = center == windows.min(axis=1)
+
+    # Flat tops/bottoms: a run of equal extremes is one swing, so drop a bar when the bar
+    # before it was already a swing of the same value. Pure mask arithmetic, no lookback scan.
+    same_as_prev = center[1:] == center[:-1]
+    hi_mask[1:] &= ~(hi_mask[:-1] & same_as_prev)
+    lo_mask[1:] &= ~(lo_mask[:-1] & same_as_prev)
 
-    return filtered_swings
+    return np.flatnonzero(hi_mask) + order, np.flatnonzero(lo_mask) + order
+
+
+def _merge_swings(pos, price, is_high):
+    """
+    Sorts swings by position (stable, so a high precedes a low on the same bar) and
+    filters consecutive swings of the same type, keeping the more extreme one
+    (the earliest on ties). Works on parallel arrays, no per-swing Python objects.
+    """
+    if len(pos) == 0:
+        return pos, price, is_high
+    by_pos = np.argsort(pos, kind='stable')
+    pos, price, is_high = pos[by_pos], price[by_pos], is_high[by_pos]
+
+    # Runs of same-type swings; in each run keep the first bar that reaches the run's extreme
+    run_starts = np.flatnonzero(np.r_[True, is_high[1:] != is_high[:-1]])
+    signed = np.where(is_high, price, -price)
+    run_ids = np.repeat(np.arange(len(run_starts)), np.diff(np.r_[run_starts, len(pos)]))
+    at_extreme = np.flatnonzero(signed == np.maximum.reduceat(signed, run_starts)[run_ids])
+    keep = at_extreme[np.unique(run_ids[at_extreme], return_index=True)[1]]
+    return pos[keep], price[keep], is_high[keep]
+
+
+def _swing_dict(ts, pos, price, is_high):
+    return {'index': ts[pos], 'price': price, 'type': 'high' if is_high else 'low'}
 
 def calculate_fib_levels(start_price, end_price, levels):
-    """Calculates Fibonacci levels for a given swing."""
-    diff = end_price - start_price
-    return {level: start_price + diff * level for level in levels}
+    """
+    Calculates Fibonacci levels for a given swing as an ndarray aligned with `levels`.
+    start_price/end_price may also be arrays of shape (n, 1) to get all swings at once
+    as an (n, len(levels)) matrix via broadcasting.
+    """
+    return start_price + (end_price - start_price) * levels
+
+
+def fib_levels_to_dict(levels, prices):
+    """Pairs each level with its price, e.g. {0.5: 113.0}, for results and status output."""
+    return dict(zip(levels.tolist(), prices.tolist()))
+
+
+def recent_retracements(swing_indices, swing_prices, pairs):
+    """
+    Retracement levels of the last `pairs` consecutive swing pairs, computed in one broadcast.
+    swing_indices/swing_prices: alternating swings in time order (ndarrays).
+    Returns {'pointA_index', 'pointB_index', 'levels', 'prices'} where 'prices' is a
+    (K, len(levels)) matrix, one row per pair from oldest to newest (K <= pairs).
+    """
+    swing_indices = swing_indices[-(pairs + 1):]
+    swing_prices = swing_prices[-(pairs + 1):]
+    starts = swing_prices[:-1, None]
+    # Only the offsets (end - start) * level run in float32 (twice the SIMD lanes); adding them
+    # back to the float64 start prices keeps the levels accurate to well under a cent.
+    offsets = (swing_prices[1:] - swing_prices[:-1]).astype(np.float32)[:, None] * RETRACEMENT_LEVELS_F32
+    return {
+        'pointA_index': swing_indices[:-1],
+        'pointB_index': swing_indices[1:],
+        'levels': RETRACEMENT_LEVELS,
+        'prices': starts + offsets,
+    }
 
 
-def analyze(all_kline_data_deque, on_status_update=None):
+def analyze(all_kline_data_deque, on_status_update=None, recent_pairs=5):
     """
     Analyzes Fibonacci retracement and extension levels based on recent major swings.
-    all_kline_data_deque: A deque of kline dictionaries.
+    all_kline_data_deque: A KlineRing, or a deque of kline dictionaries.
     on_status_update: Callback for status messages.
+    recent_pairs: How many of the latest swing pairs to include in 'recent_retracements'.
 
     This is a basic implementation focusing on Retracements from the last major swing.
     "Circular/Cascade/Concentric" Fibonacci are not standard and require specific definitions.
@@ -98,43 +141,48 @@ def analyze(all_kline_data_deque, on_status_update=None):
     if len(all_kline_data_deque) < 15: # Need some data to find swings (e.g., 2*order+1 for order=5, or 2*3+1=7 for order=3)
         return {"status": "Not enough kline data for Fibonacci analysis."}
 
-    # Use high prices for swing highs, low prices for swing lows
-    high_prices = pd.Series([float(k['h']) for k in all_kline_data_deque], index=[k['t'] for k in all_kline_data_deque])
-    low_prices = pd.Series([float(k['l']) for k in all_kline_data_deque], index=[k['t'] for k in all_kline_data_deque])
-    close_prices = pd.Series([float(k['c']) for k in all_kline_data_deque], index=[k['t'] for k in all_kline_data_deque])
-
-
-    swing_highs = find_significant_swings(high_prices, order=3)
-    swing_lows = find_significant_swings(low_prices, order=3)
-
-    all_swings = sorted(swing_highs + swing_lows, key=lambda x: x['index'])
-
-    if not all_swings:
+    # Use high prices for swing highs, low prices for swing lows.
+    if isinstance(all_kline_data_deque, KlineRing):
+        # Contiguous views straight out of the ring, nothing to parse or copy
+        ts = all_kline_data_deque.timestamps()
+        high_prices = all_kline_data_deque.column('h').astype(np.float64, copy=False)
+        low_prices = all_kline_data_deque.column('l').astype(np.float64, copy=False)
+        current_price = float(all_kline_data_deque.last('c'))
+    else:
+        # One pass over the deque; NumPy converts the fields (floats or raw strings) in C.
+        ts = np.array([k['t'] for k in all_kline_data_deque])
+        hlc = np.array([(k['h'], k['l'], k['c']) for k in all_kline_data_deque], dtype=np.float64)
+        high_prices = hlc[:, 0]
+        low_prices = hlc[:, 1]
+        current_price = hlc[-1, 2]
+
+    # Swing highs only from the highs and swing lows only from the lows (as FibSwingDetector does),
+    # then one merge so they alternate
+    hi_pos = _swing_positions(high_prices, 3)[0]
+    lo_pos = _swing_positions(low_prices, 3)[1]
+    pos, price, is_high = _merge_swings(
+        np.concatenate((hi_pos, lo_pos)),
+        np.concatenate((high_prices[hi_pos], low_prices[lo_pos])),
+        np.concatenate((np.ones(len(hi_pos), dtype=bool), np.zeros(len(lo_pos), dtype=bool))))
+
+    if len(pos) == 0:
         return {"status": "No significant swings found for Fibonacci analysis."}
 
-    filtered_swings = [all_swings[0]]
-    for i in range(1, len(all_swings)):
-        if all_swings[i]['type'] != filtered_swings[-1]['type']:
-            filtered_swings.append(all_swings[i])
-        else:
-            if all_swings[i]['type'] == 'high' and all_swings[i]['price'] > filtered_swings[-1]['price']:
-                filtered_swings[-1] = all_swings[i]
-            elif all_swings[i]['type'] == 'low' and all_swings[i]['price'] < filtered_swings[-1]['price']:
-                filtered_swings[-1] = all_swings[i]
-
-
-    if len(filtered_swings) < 2:
+    if len(pos) < 2:
         return {"status": "Not enough alternating swings to define a Fibonacci range."}
 
-    last_swing = filtered_swings[-1]
-    prev_swing = filtered_swings[-2]
-
-    pointA = prev_swing
-    pointB = last_swing
+    pointA = _swing_dict(ts, pos[-2], price[-2], is_high[-2])
+    pointB = _swing_dict(ts, pos[-1], price[-1], is_high[-1])
+    recent = recent_retracements(ts[pos], price, recent_pairs)
+    return _build_retracement_result(pointA, pointB, current_price, on_status_update, recent_retracements=recent)
 
-    current_price = close_prices.iloc[-1]
-    retracements = {}
 
+def _build_retracement_result(pointA, pointB, current_price, on_status_update=None, retracement_levels=None, recent_retracements=None):
+    """
+    Builds the analysis result dict for the move from swing pointA to swing pointB.
+    retracement_levels: optional precomputed {level: price} dict for this swing pair.
+    recent_retracements: optional result of recent_retracements(), passed through as is.
+    """
     trend_type = "unknown"
     # For retracements of the move from pointA to pointB:
     # If pointA is low and pointB is high (uptrend), levels are B - (B-A)*level_val or A + (B-A)*level_val
@@ -146,15 +194,16 @@ def analyze(all_kline_data_deque, on_status_update=None):
 
     if pointB['type'] == 'high' and pointA['type'] == 'low': # Uptrend A->B
         trend_type = "uptrend"
-        retracements = calculate_fib_levels(pointA['price'], pointB['price'], RETRACEMENT_LEVELS)
     elif pointB['type'] == 'low' and pointA['type'] == 'high': # Downtrend A->B
         trend_type = "downtrend"
-        retracements = calculate_fib_levels(pointA['price'], pointB['price'], RETRACEMENT_LEVELS)
     else: # Should not happen if swings are alternating
         return {"status": "Last two swings are of the same type, cannot define range."}
 
 
-    if on_status_update and retracements:
+    if retracement_levels is None:
+        retracement_levels = fib_levels_to_dict(RETRACEMENT_LEVELS, calculate_fib_levels(pointA['price'], pointB['price'], RETRACEMENT_LEVELS))
+
+    if on_status_update:
         on_status_update(f"[FibonacciAnalysis] Trend: {trend_type}. Swing A({pointA['type']}): {pointA['price']:.2f} at {pointA['index']}, B({pointB['type']}): {pointB['price']:.2f} at {pointB['index']}.")
 
     return {
@@ -162,10 +211,112 @@ def analyze(all_kline_data_deque, on_status_update=None):
         "last_swing_pointA": pointA,
         "last_swing_pointB": pointB,
         "trend_type": trend_type,
-        "retracement_levels_A_to_B": retracements,
-        "current_price_for_context": current_price
+        "retracement_levels_A_to_B": retracement_levels,
+        "current_price_for_context": current_price,
+        "recent_retracements": recent_retracements
     }
 
+
+class FibSwingDetector:
+    """
+    Streaming counterpart of analyze() (with order=3) for live updates.
+    Feed one bar at a time via update(); each call costs O(1) amortized instead of
+    re-scanning the whole history. Swing highs are taken from high prices and swing lows
+    from low prices, using the same `order` rule as find_significant_swings: a bar is a
+    swing once `order` later bars have closed and none of the 2*order+1 bars around it
+    exceeds it. Fed the same bars, analyze() returns the same swings and levels; it only
+    differs once bars have dropped out of the window it is given, since the detector keeps
+    the swings confirmed from the full history.
+    """
+    def __init__(self, order=3, recent_pairs=5):
+        self.order = order
+        self.recent_pairs = recent_pairs
+        self.bar_count = 0
+        self.last_close = None
+        # Monotonic deques of (position, price, timestamp): prices decreasing in _max_dq,
+        # increasing in _min_dq, so the front is always the extreme of the current window.
+        self._max_dq = deque()
+        self._min_dq = deque()
+        self._recent = deque(maxlen=2 * order + 1) # (timestamp, high, low) of the current window
+        self._prev_is_high = False # Whether the previous candidate bar was a window max/min
+        self._prev_is_low = False
+        self._swings = deque(maxlen=recent_pairs + 1) # Latest confirmed alternating swings
+        # Retracement levels only change when a new swing is confirmed, so keep them per swing set
+        self._levels_key = None
+        self._levels = None
+        self._recent_levels = None
+
+    def update(self, timestamp, high, low, close):
+        """Adds a closed bar and confirms the swing (if any) `order` bars back."""
+        order = self.order
+        i = self.bar_count
+        self.bar_count += 1
+        self.last_close = close
+        self._recent.append((timestamp, high, low))
+
+        max_dq = self._max_dq
+        while max_dq and max_dq[-1][1] < high:
+            max_dq.pop()
+        max_dq.append((i, high, timestamp))
+        while max_dq[0][0] < i - 2 * order:
+            max_dq.popleft()
+
+        min_dq = self._min_dq
+        while min_dq and min_dq[-1][1] > low:
+            min_dq.pop()
+        min_dq.append((i, low, timestamp))
+        while min_dq[0][0] < i - 2 * order:
+            min_dq.popleft()
+
+        c = i - order # Candidate bar, now with `order` bars on each side
+        if c < order:
+            return
+        recent = self._recent
+        c_time, c_high, c_low = recent[order]
+
+        # Flat tops/bottoms count once: skip a bar when the bar before it was already a
+        # swing of the same value (same rule as find_significant_swings).
+        is_high = max_dq[0][1] == c_high
+        if is_high and not (self._prev_is_high and c_high == recent[order - 1][1]):
+            self._push_swing({'index': c_time, 'price': c_high, 'type': 'high'})
+        self._prev_is_high = is_high
+
+        is_low = min_dq[0][1] == c_low
+        if is_low and not (self._prev_is_low and c_low == recent[order - 1][2]):
+            self._push_swing({'index': c_time, 'price': c_low, 'type': 'low'})
+        self._prev_is_low = is_low
+
+    def _push_swing(self, swing):
+        swings = self._swings
+        if swings and swings[-1]['type'] == swing['type']:
+            # Keep the more extreme one if same type consecutively
+            if (swing['type'] == 'high' and swing['price'] > swings[-1]['price']) or \
+               (swing['type'] == 'low' and swing['price'] < swings[-1]['price']):
+                swings[-1] = swing
+        else:
+            swings.append(swing)
+
+    def analyze(self, on_status_update=None):
+        """Returns the same result structure as analyze() from the swings confirmed so far."""
+        if on_status_update:
+            on_status_update("[FibonacciAnalysis] Analyzing standard retracements/extensions (streaming swings)...")
+
+        if self.bar_count < 15:
+            return {"status": "Not enough kline data for Fibonacci analysis."}
+        if not self._swings:
+            return {"status": "No significant swings found for Fibonacci analysis."}
+        if len(self._swings) < 2:
+            return {"status": "Not enough alternating swings to define a Fibonacci range."}
+
+        pointA, pointB = self._swings[-2], self._swings[-1]
+        key = tuple(s['index'] for s in self._swings)
+        if key != self._levels_key:
+            self._levels_key = key
+            self._levels = fib_levels_to_dict(RETRACEMENT_LEVELS, calculate_fib_levels(pointA['price'], pointB['price'], RETRACEMENT_LEVELS))
+            self._recent_levels = recent_retracements(
+                np.array(key), np.array([s['price'] for s in self._swings], dtype=np.float64), self.recent_pairs)
+        return _build_retracement_result(pointA, pointB, self.last_close, on_status_update, self._levels, self._recent_levels)
+
 if __name__ == '__main__':
     print("Testing fibonacci_analysis.py...")
 
@@ -177,7 +328,7 @@ if __name__ == '__main__':
     data_points = [
         {'t': 1, 'h': '105', 'l': '100', 'c': '101', 'o': '101', 'v': '100'},
         {'t': 2, 'h': '106', 'l': '101', 'c': '102', 'o': '102', 'v': '100'},
-        {'t': 3, 'h': '107', 'l': '100', 'c': '103', 'o': '103', 'v': '100'}, # Actual swing low L=100 at t=3 (original was t=1)
+        {'t': 3, 'h': '107', 'l': '100', 'c': '103', 'o': '103', 'v': '100'}, # Low L=100 at t=3, too close to the start to be a swing
         {'t': 4, 'h': '125', 'l': '120', 'c': '123', 'o': '123', 'v': '100'},
         {'t': 5, 'h': '126', 'l': '119', 'c': '122', 'o': '122', 'v': '100'}, # Actual swing high H=126 at t=5 (original was t=4 H=125)
         {'t': 6, 'h': '123', 'l': '118', 'c': '121', 'o': '121', 'v': '100'},
@@ -206,28 +357,30 @@ if __name__ == '__main__':
         for level, price in fib_results["retracement_levels_A_to_B"].items():
             print(f"  {level*100:.1f}% : {price:.2f}")
 
-        # Expected: Swing Low A (100 at t=3), Swing High B (126 at t=5)
-        # Uptrend A->B. diff = 126 - 100 = 26.
+        # Expected: Swing High A (126 at t=5), Swing Low B (110 at t=7); the low of 100 at t=3 has
+        # fewer than 3 bars before it, so it is not a swing.
+        # Downtrend A->B. diff = 110 - 126 = -16.
         # Levels are A + diff * level_value
-        # 0.0% => 100 + 26*0.0 = 100.0 (Point A)
-        # 23.6% => 100 + 26*0.236 = 100 + 6.136 = 106.14
-        # 38.2% => 100 + 26*0.382 = 100 + 9.932 = 109.93
-        # 50.0% => 100 + 26*0.5 = 100 + 13.0 = 113.0
-        # 61.8% => 100 + 26*0.618 = 100 + 16.068 = 116.07
-        # 78.6% => 100 + 26*0.786 = 100 + 20.436 = 120.44
-        # 100.0% => 100 + 26*1.0 = 126.0 (Point B)
-
-        assert fib_results['last_swing_pointA']['price'] == 100
-        assert fib_results['last_swing_pointB']['price'] == 126
-        assert abs(fib_results["retracement_levels_A_to_B"][0.0] - 100.0) < 0.01
-        assert abs(fib_results["retracement_levels_A_to_B"][0.5] - 113.0) < 0.01
-        assert abs(fib_results["retracement_levels_A_to_B"][1.0] - 126.0) < 0.01
+        # 0.0% => 126 - 16*0.0 = 126.0 (Point A)
+        # 23.6% => 126 - 16*0.236 = 126 - 3.776 = 122.22
+        # 38.2% => 126 - 16*0.382 = 126 - 6.112 = 119.89
+        # 50.0% => 126 - 16*0.5 = 126 - 8.0 = 118.0
+        # 61.8% => 126 - 16*0.618 = 126 - 9.888 = 116.11
+        # 78.6% => 126 - 16*0.786 = 126 - 12.576 = 113.42
+        # 100.0% => 126 - 16*1.0 = 110.0 (Point B)
+
+        assert fib_results['trend_type'] == 'downtrend'
+        assert fib_results['last_swing_pointA']['price'] == 126
+        assert fib_results['last_swing_pointB']['price'] == 110
+        assert abs(fib_results["retracement_levels_A_to_B"][0.0] - 126.0) < 0.01
+        assert abs(fib_results["retracement_levels_A_to_B"][0.5] - 118.0) < 0.01
+        assert abs(fib_results["retracement_levels_A_to_B"][1.0] - 110.0) < 0.01
 
     else:
         print(f"Fibonacci analysis failed or no levels: {fib_results}")
 
     print("\n--- Test with insufficient data ---")
-    short_deque = deque(list(test_deque)[:5]) # Only 5 data points
+    short_deque = deque(islice(test_deque, 5)) # Only 5 data points
     fib_results_short = analyze(short_deque, on_status_update=test_status_update_fib)
     print(f"Fibonacci results (short data): {fib_results_short}")
     assert "Not enough kline data" in fib_results_short.get("status","")
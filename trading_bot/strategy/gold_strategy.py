@@ -1,5 +1,8 @@
 import pandas as pd
-from collections import deque
+import numpy as np
+import threading
+from types import SimpleNamespace
+from typing import NamedTuple, Optional
 
 # Assuming calculator.py is in trading_bot.indicators
 from trading_bot.indicators import calculator
@@ -9,11 +12,81 @@ from . import fibonacci_analysis
 from . import pivot_points
 from . import liquidity_analysis
 from trading_bot.utils import settings
+from trading_bot.utils.kline_ring import KlineRing
 
 import logging
 
 logger = logging.getLogger(__name__)
 
+MS_PER_DAY = 86_400_000
+
+LONG_SR_CONFIRMATIONS = ('BOUNCE_SUPPORT_PIVOT', 'BOUNCE_SUPPORT_FIB', 'BOUNCE_SUPPORT_LIQ', 'BREAKOUT_ABOVE_R1_PIVOT')
+SHORT_SR_CONFIRMATIONS = ('REJECT_RESISTANCE_PIVOT', 'REJECT_RESISTANCE_FIB', 'REJECT_RESISTANCE_LIQ', 'BREAKDOWN_BELOW_S1_PIVOT')
+MOVE_SUPPORTING_VOLUMES = ('AVERAGE_VOLUME', 'HIGH_VOLUME')
+
+# Points each assessed state adds to the (LONG, SHORT) consolidation scores, one table per
+# assessment in score_consolidation() argument order. States not listed add nothing.
+CONSOLIDATION_POINTS = (
+    { # Trend
+        'STRONG_BULLISH_TREND': (2, 0), 'BULLISH_TREND_ST': (1, 0), 'BULLISH_TREND_SAR': (1, 0),
+        'STRONG_BEARISH_TREND': (0, 2), 'BEARISH_TREND_ST': (0, 1), 'BEARISH_TREND_SAR': (0, 1)
+    },
+    {'STRONG_BULLISH': (2, 0), 'BULLISH': (1, 0), 'STRONG_BEARISH': (0, 2), 'BEARISH': (0, 1)}, # MACD
+    {'BULLISH': (1, 0), 'BEARISH': (0, 1)}, # RSI
+    {'BULLISH': (1, 0), 'OVERSOLD': (1, 0), 'BEARISH': (0, 1), 'OVERBOUGHT': (0, 1)}, # KDJ
+    {'BROKE_BEARISH_FRACTAL_UP': (1, 0), 'BROKE_BULLISH_FRACTAL_DOWN': (0, 1)}, # Fractal
+    {**{state: (2, 0) for state in LONG_SR_CONFIRMATIONS}, **{state: (0, 2) for state in SHORT_SR_CONFIRMATIONS}}, # S/R
+    {'HIGH_VOLUME': (2, 2), 'AVERAGE_VOLUME': (1, 1)} # Volume backs either direction equally
+)
+NO_POINTS = (0, 0)
+MAX_CONSOLIDATION_SCORE = sum(max(long_pts for long_pts, _ in points.values()) for points in CONSOLIDATION_POINTS) # 11, same for SHORT
+
+class IndicatorSnapshot(NamedTuple):
+    """Latest indicator results for one aggregated bar, as passed to _generate_signal. None where not enough data."""
+    macd: Optional[dict]
+    rsi: Optional[float]
+    supertrend: Optional[dict]
+    kdj: Optional[dict]
+    sar: Optional[dict]
+    fractal: Optional[dict]
+    momentum: Optional[float]
+    atr: Optional[float]
+
+class AnalysisSnapshot(NamedTuple):
+    """Support/resistance analyses for one aggregated bar, as passed to _generate_signal."""
+    fibonacci: Optional[dict]
+    pivots: Optional[dict]
+    liquidity: Optional[dict] # Derived from the order book, not from the bars
+
+class Signal(NamedTuple):
+    """
+    Result of _generate_signal: a LONG/SHORT trade (price, tp, sl) or CONSOLIDATION_INFO (long_perc, short_perc).
+    Fields that do not apply to the type are None.
+    """
+    type: str
+    price: Optional[float] = None
+    tp: Optional[float] = None
+    sl: Optional[float] = None
+    long_perc: Optional[float] = None
+    short_perc: Optional[float] = None
+    debug_states: Optional[dict] = None
+
+def score_consolidation(trend_state, macd_state, rsi_state, kdj_state, fractal_assessment, sr_level_assessment, volume_assessment):
+    """
+    Scores how far the assessed states lean towards a LONG and towards a SHORT signal.
+    Each state is one lookup in CONSOLIDATION_POINTS; both directions are scored in the same pass.
+    Returns (long_percentage, short_percentage).
+    """
+    long_score = 0
+    short_score = 0
+    states = (trend_state, macd_state, rsi_state, kdj_state, fractal_assessment, sr_level_assessment, volume_assessment)
+    for points, state in zip(CONSOLIDATION_POINTS, states):
+        long_pts, short_pts = points.get(state, NO_POINTS)
+        long_score += long_pts
+        short_score += short_pts
+
+    return (long_score / MAX_CONSOLIDATION_SCORE) * 100, (short_score / MAX_CONSOLIDATION_SCORE) * 100
+
 class GoldenStrategy:
     def __init__(self, on_status_update=None, on_indicators_update=None, on_signal_update=None, on_chart_update=None, on_liquidity_update_callback=None):
         self.on_status_update = on_status_update
@@ -25,13 +98,16 @@ class GoldenStrategy:
         self.latest_liquidity_analysis = None
 
         self.raw_kline_max_len = 200
-        self.raw_all_kline_data_deque = deque(maxlen=self.raw_kline_max_len)
+        # Base klines are only kept for reference, never fed to the indicators, so float32 is precise enough
+        self.raw_klines = KlineRing(self.raw_kline_max_len, dtype=np.float32)
 
         self.strategy_timeframe_str = settings.STRATEGY_TIMEFRAME
         td_str = self.strategy_timeframe_str.lower()
         if 't' in td_str and not 'min' in td_str:
             td_str = td_str.replace('t', 'min')
         self.timeframe_delta = pd.Timedelta(td_str)
+        # Bars are epoch-aligned buckets, so a kline's bar start is plain integer arithmetic on its ms time
+        self.timeframe_ms = self.timeframe_delta.value // 1_000_000
 
         buffer_for_indicators = 20
         min_bars_needed = max(
@@ -42,154 +118,287 @@ class GoldenStrategy:
             settings.ATR_PERIOD
         )
         self.agg_kline_max_len = min_bars_needed + buffer_for_indicators
-
-        self.agg_open_prices = deque(maxlen=self.agg_kline_max_len)
-        self.agg_high_prices = deque(maxlen=self.agg_kline_max_len)
-        self.agg_low_prices = deque(maxlen=self.agg_kline_max_len)
-        self.agg_close_prices = deque(maxlen=self.agg_kline_max_len)
-        self.agg_volumes = deque(maxlen=self.agg_kline_max_len)
-        self.agg_timestamps = deque(maxlen=self.agg_kline_max_len)
-        self.agg_kline_data_deque = deque(maxlen=self.agg_kline_max_len)
-
-        self.current_agg_kline_buffer = []
-        self.last_agg_bar_start_time = None
+        # Bars required before signals are generated; fixed by the indicator periods, like the ring size
+        self.min_agg_bars_for_strategy = min_bars_needed + 5
+
+        # Aggregated bars as column arrays; indicators and analysis read zero-copy views from it.
+        # Kept float64: float32 rounds BTC-range prices to ~0.004 and shifts every indicator value
+        self.agg_klines = KlineRing(self.agg_kline_max_len)
+        self.fib_swing_detector = fibonacci_analysis.FibSwingDetector(order=3, recent_pairs=settings.FIB_RECENT_SWING_PAIRS)
+
+        # Running states of the recursive indicators, advanced once per finalized bar (see _update_indicators)
+        self._ind_state = {}
+        self._bars_since_indicator_rebuild = 0
+        self.latest_indicators = {}
+        self.refresh_settings()
+
+        # Daily pivots only change when the UTC day rolls over or previous-day bars leave the ring
+        self._pivot_cache_key = None
+        self._pivot_cache_result = None
+
+        # The forming aggregated bar, accumulated kline by kline (start is None until the first kline)
+        self._cur_bar_start_ms = None
+        self._cur_open = self._cur_high = self._cur_low = self._cur_close = self._cur_volume = None
         self.is_historical_fill_active = False
 
+        # Guards agg_klines, indicator states and analysis caches between kline ingest and the signal worker
+        self._state_lock = threading.RLock()
+        self._compute_requested = threading.Event()
+        self._analysis_pending = False
+        self._signal_worker_stopping = False
+        self._signal_worker = None
+        if settings.STRATEGY_COMPUTE_THREAD:
+            self.start_signal_worker()
+
         if self.on_status_update:
             self.on_status_update(f"[GoldenStrategy] Initialized for timeframe: {self.strategy_timeframe_str}. Agg history len: {self.agg_kline_max_len} (needs {min_bars_needed} for indicators).")
 
+    def refresh_settings(self):
+        """
+        Snapshots the signal thresholds read on every bar into `self._c`, so the assessment helpers
+        use attribute reads instead of module lookups and getattr defaults.
+        Call again after changing `settings` at runtime.
+        """
+        prox_factor = getattr(settings, 'SR_PROXIMITY_FACTOR', 0.003)
+        self._c = SimpleNamespace(
+            macd_hist_strength_threshold=getattr(settings, 'MACD_HIST_STRENGTH_THRESHOLD', 0.0001),
+            rsi_overbought=settings.STRATEGY_RSI_OVERBOUGHT,
+            rsi_oversold=settings.STRATEGY_RSI_OVERSOLD,
+            rsi_bullish_confirm=getattr(settings, 'RSI_BULLISH_CONFIRM', 55),
+            rsi_bearish_confirm=getattr(settings, 'RSI_BEARISH_CONFIRM', 45),
+            kdj_j_overbought=getattr(settings, 'KDJ_J_OVERBOUGHT', 90),
+            kdj_j_oversold=getattr(settings, 'KDJ_J_OVERSOLD', 10),
+            kdj_k_confirm_overbought=getattr(settings, 'KDJ_K_CONFIRM_OVERBOUGHT', 80),
+            kdj_k_confirm_oversold=getattr(settings, 'KDJ_K_CONFIRM_OVERSOLD', 20),
+            sr_support_band=1 + prox_factor, # Level touched if bar low <= level * band
+            sr_resistance_band=1 - prox_factor, # Level touched if bar high >= level * band
+            sr_breakout_band=1 + prox_factor / 2, # Closed clearly above R1
+            sr_breakdown_band=1 - prox_factor / 2, # Closed clearly below S1
+            liquidity_levels_to_check=getattr(settings, 'LIQUIDITY_LEVELS_TO_CHECK', 2),
+            volume_avg_period=getattr(settings, 'VOLUME_AVG_PERIOD', 20),
+            volume_high_multiplier=getattr(settings, 'VOLUME_HIGH_MULTIPLIER', 1.5),
+            volume_low_multiplier=getattr(settings, 'VOLUME_LOW_MULTIPLIER', 0.7),
+            sl_price_buffer_atr_factor=getattr(settings, 'SL_PRICE_BUFFER_ATR_FACTOR', 0.1),
+            atr_sl_multiplier=settings.ATR_SL_MULTIPLIER,
+            atr_tp_multiplier=settings.ATR_TP_MULTIPLIER,
+            min_sl_fallback_percentage=settings.MIN_SL_FALLBACK_PERCENTAGE,
+            min_tp_fallback_percentage=settings.MIN_TP_FALLBACK_PERCENTAGE,
+            min_sl_distance_percentage=settings.MIN_SL_DISTANCE_PERCENTAGE,
+            min_tp_distance_percentage=settings.MIN_TP_DISTANCE_PERCENTAGE,
+            min_rr_ratio=settings.MIN_RR_RATIO
+        )
+
     def _process_incoming_kline(self, kline_data):
         try:
             k_time_ms = int(kline_data['t'])
-            k_time_dt = pd.to_datetime(k_time_ms, unit='ms', utc=True)
             k_open = float(kline_data['o'])
             k_high = float(kline_data['h'])
             k_low = float(kline_data['l'])
             k_close = float(kline_data['c'])
             k_volume = float(kline_data['v'])
-
-            processed_kline = {
-                't_ms': k_time_ms,
-                't_dt': k_time_dt,
-                'o': k_open, 'h': k_high,
-                'l': k_low, 'c': k_close, 'v': k_volume
-            }
-            self.raw_all_kline_data_deque.append(processed_kline)
+            self.raw_klines.append(k_time_ms, k_open, k_high, k_low, k_close, k_volume)
         except (KeyError, ValueError) as e:
             logger.error(f"[GoldenStrategy] Invalid kline data for raw storage: {e}. Data: {kline_data}")
             return
 
-        self.current_agg_kline_buffer.append(processed_kline)
+        current_bar_start_ms = k_time_ms - k_time_ms % self.timeframe_ms
+        completed_bar_start_ms = self._cur_bar_start_ms
+
+        if current_bar_start_ms == completed_bar_start_ms:
+            # Same bar: fold the kline into the running OHLCV
+            if k_high > self._cur_high: self._cur_high = k_high
+            if k_low < self._cur_low: self._cur_low = k_low
+            self._cur_close = k_close
+            self._cur_volume += k_volume
+        elif completed_bar_start_ms is None or current_bar_start_ms > completed_bar_start_ms:
+            self._start_bar(current_bar_start_ms, k_open, k_high, k_low, k_close, k_volume)
+        else:
+            # Kline for a bar that has already been finalized; it cannot be added to it any more
+            logger.debug("[GoldenStrategy] Ignoring late kline at %d for a finalized bar.", k_time_ms)
+            return
 
         if not self.is_historical_fill_active:
             self._trigger_provisional_chart_update()
 
-        if not self.current_agg_kline_buffer:
-            return
-
-        current_kline_agg_period_start_time = processed_kline['t_dt'].floor(self.timeframe_delta)
-
-        if self.last_agg_bar_start_time is None:
-            self.last_agg_bar_start_time = current_kline_agg_period_start_time
-            if self.on_status_update:
-                 self.on_status_update(f"[GoldenStrategy] First kline received. Aggregation period started at {self.last_agg_bar_start_time.strftime('%Y-%m-%d %H:%M:%S')} for timeframe {self.strategy_timeframe_str}.")
-            if not self.is_historical_fill_active:
-                self._trigger_provisional_chart_update()
+    def _start_bar(self, bar_start_ms, bar_open, bar_high, bar_low, bar_close, bar_volume):
+        """Opens a new forming bar from the given OHLCV and finalizes the one it replaces."""
+        completed_bar_start_ms = self._cur_bar_start_ms
+        completed_bar = (self._cur_open, self._cur_high, self._cur_low, self._cur_close, self._cur_volume)
+        # Start the new bar first, so anything published while finalizing sees it as the forming bar
+        self._cur_bar_start_ms = bar_start_ms
+        self._cur_open, self._cur_high, self._cur_low, self._cur_close, self._cur_volume = bar_open, bar_high, bar_low, bar_close, bar_volume
 
-        if current_kline_agg_period_start_time > self.last_agg_bar_start_time:
-            klines_for_completed_bar = [
-                k for k in self.current_agg_kline_buffer
-                if k['t_dt'] >= self.last_agg_bar_start_time and k['t_dt'] < current_kline_agg_period_start_time
-            ]
-
-            if klines_for_completed_bar:
-                self._finalize_and_process_aggregated_bar(klines_for_completed_bar, self.last_agg_bar_start_time)
-
-                self.current_agg_kline_buffer = [
-                    k for k in self.current_agg_kline_buffer if k['t_dt'] >= current_kline_agg_period_start_time
-                ]
-            else:
-                if self.on_status_update:
-                    self.on_status_update(f"[GoldenStrategy] Potential data gap or timing issue: No klines found for completed bar period {self.last_agg_bar_start_time.strftime('%Y-%m-%d %H:%M:%S')}.")
+        # Per-bar status lines are not built during the historical fill; main.py reports fill progress per batch
+        if completed_bar_start_ms is None:
+            if self.on_status_update and not self.is_historical_fill_active:
+                 self.on_status_update(f"[GoldenStrategy] First kline received. Aggregation period started at {pd.Timestamp(bar_start_ms, unit='ms', tz='UTC').strftime('%Y-%m-%d %H:%M:%S')} for timeframe {self.strategy_timeframe_str}.")
+        else:
+            self._finalize_and_process_aggregated_bar(completed_bar_start_ms, *completed_bar)
+            if bar_start_ms - completed_bar_start_ms > self.timeframe_ms:
+                if self.is_historical_fill_active:
+                    logger.debug("[GoldenStrategy] Data gap in historical klines: no klines for the bar starting at %d ms.", completed_bar_start_ms + self.timeframe_ms)
+                elif self.on_status_update:
+                    self.on_status_update(f"[GoldenStrategy] Potential data gap or timing issue: No klines found for completed bar period {pd.Timestamp(completed_bar_start_ms + self.timeframe_ms, unit='ms', tz='UTC').strftime('%Y-%m-%d %H:%M:%S')}.")
+
+    def _finalize_and_process_aggregated_bar(self, bar_start_ms, agg_open, agg_high, agg_low, agg_close, agg_volume):
+        with self._state_lock:
+            self.agg_klines.append(bar_start_ms, agg_open, agg_high, agg_low, agg_close, agg_volume)
+            self.fib_swing_detector.update(bar_start_ms, agg_high, agg_low, agg_close)
+            self._update_indicators()
 
-            self.last_agg_bar_start_time = current_kline_agg_period_start_time
-            if not self.is_historical_fill_active:
-                 self._trigger_provisional_chart_update()
+        if self.on_status_update and not self.is_historical_fill_active:
+            self.on_status_update(f"[GoldenStrategy] New {self.strategy_timeframe_str} bar: O:{agg_open:.2f} H:{agg_high:.2f} L:{agg_low:.2f} C:{agg_close:.2f} V:{agg_volume:.2f} @ {pd.Timestamp(bar_start_ms, unit='ms', tz='UTC').strftime('%Y-%m-%d %H:%M:%S UTC')}")
+
+        # Checked and flagged under the lock, so the worker cannot exit between the check and the flag
+        with self._state_lock:
+            hand_to_worker = self._signal_worker is not None and not self.is_historical_fill_active
+            if hand_to_worker:
+                self._analysis_pending = True
+                self._compute_requested.set()
+        if not hand_to_worker:
+            self._compute_and_emit()
+
+    def _compute_and_emit(self):
+        """ Runs the analysis and signal generation for the newest aggregated bar and publishes the results. """
+        with self._state_lock:
+            self._run_strategy_on_aggregated_data()
+
+    def start_signal_worker(self):
+        """
+        Moves _compute_and_emit() off the ingest thread onto a daemon worker. Finalizing a bar then only
+        appends it and advances the indicator states; the worker is woken through an Event, so bars
+        that complete while it is still busy are coalesced into one run on the newest bar.
+        """
+        with self._state_lock:
+            # A worker that has not exited yet (e.g. a stop timed out) is kept, so only one loop waits on the Event
+            self._signal_worker_stopping = False
+            if self._signal_worker is not None:
+                return
+            self._signal_worker = threading.Thread(target=self._signal_worker_loop, name='GoldenStrategySignalWorker', daemon=True)
+            self._signal_worker.start()
 
-    def _finalize_and_process_aggregated_bar(self, bar_klines, bar_start_time_dt):
-        if not bar_klines:
+    def stop_signal_worker(self, timeout=None):
+        """
+        Stops the worker after it has analysed any bar still pending. Bars finalized afterwards run inline again.
+        If the worker is still busy when `timeout` expires, it stays registered and exits on its own once done.
+        """
+        worker = self._signal_worker
+        if worker is None:
             return
+        self._signal_worker_stopping = True
+        self._compute_requested.set()
+        worker.join(timeout)
+        if worker.is_alive():
+            logger.warning("[GoldenStrategy] Signal worker still busy after %s s; it will stop after its current run.", timeout)
+
+    def _signal_worker_loop(self):
+        while True:
+            self._compute_requested.wait()
+            self._compute_requested.clear()
+            # Bars finalized while a run is busy set the flag again; drain them before checking for stop
+            while self._analysis_pending:
+                self._analysis_pending = False
+                try:
+                    self._compute_and_emit()
+                except Exception:
+                    logger.exception("[GoldenStrategy] Signal worker failed to analyse the latest bar.")
+            if self._signal_worker_stopping:
+                with self._state_lock:
+                    if self._signal_worker_stopping and not self._analysis_pending:
+                        # Unregistered under the lock: bars finalized from here on run inline on the ingest thread
+                        self._signal_worker = None
+                        return
+                # A bar was flagged after the drain, or the worker was restarted; keep serving the Event
+
+    def _update_indicators(self):
+        """
+        Folds the newest aggregated bar into the running indicator states, O(1) per indicator.
+        The states are rebuilt from the whole ring on the first bar and then every
+        INDICATOR_FULL_RECALC_INTERVAL bars, so rounding drift cannot build up indefinitely.
+        """
+        if not self._ind_state or self._bars_since_indicator_rebuild >= settings.INDICATOR_FULL_RECALC_INTERVAL:
+            self._ind_state = {
+                'macd': calculator.init_macd_state(), 'rsi': calculator.init_rsi_state(),
+                'atr': calculator.init_atr_state(), 'supertrend': calculator.init_supertrend_state(),
+                'kdj': calculator.init_kdj_state(), 'sar': calculator.init_sar_state()
+            }
+            self._bars_since_indicator_rebuild = 0
+            first_new_bar = 0
+        else:
+            first_new_bar = len(self.agg_klines) - 1
+
+        highs = self.agg_klines.column('h')
+        lows = self.agg_klines.column('l')
+        closes = self.agg_klines.column('c')
+        state = self._ind_state
+        for i in range(first_new_bar, len(closes)):
+            high, low, close = float(highs[i]), float(lows[i]), float(closes[i])
+            kdj_window = slice(max(0, i + 1 - settings.KDJ_N_PERIOD), i + 1)
+            atr_value = calculator.update_atr(state['atr'], high, low, close, period=settings.ATR_PERIOD)
+            self.latest_indicators = {
+                'macd': calculator.update_macd(state['macd'], close, short_period=settings.MACD_SHORT_PERIOD, long_period=settings.MACD_LONG_PERIOD, signal_period=settings.MACD_SIGNAL_PERIOD),
+                'rsi': calculator.update_rsi(state['rsi'], close, period=settings.RSI_PERIOD),
+                'supertrend': calculator.update_supertrend(state['supertrend'], high, low, close, atr_value, atr_multiplier=settings.SUPERTREND_MULTIPLIER),
+                'kdj': calculator.update_kdj(state['kdj'], highs[kdj_window], lows[kdj_window], close, n_period=settings.KDJ_N_PERIOD, m1_period=settings.KDJ_M1_PERIOD, m2_period=settings.KDJ_M2_PERIOD),
+                'sar': calculator.update_sar(state['sar'], high, low, initial_af=settings.SAR_INITIAL_AF, max_af=settings.SAR_MAX_AF, af_increment=settings.SAR_AF_INCREMENT),
+                'atr': atr_value
+            }
+        self._bars_since_indicator_rebuild += 1
 
-        agg_open = bar_klines[0]['o']
-        agg_high = max(k['h'] for k in bar_klines)
-        agg_low = min(k['l'] for k in bar_klines)
-        agg_close = bar_klines[-1]['c']
-        agg_volume = sum(k['v'] for k in bar_klines)
-
-        self.agg_open_prices.append(agg_open)
-        self.agg_high_prices.append(agg_high)
-        self.agg_low_prices.append(agg_low)
-        self.agg_close_prices.append(agg_close)
-        self.agg_volumes.append(agg_volume)
-        self.agg_timestamps.append(bar_start_time_dt)
-
-        aggregated_kline_data = {
-            't': int(bar_start_time_dt.timestamp() * 1000),
-            'ts_datetime': bar_start_time_dt,
-            'o': agg_open, 'h': agg_high, 'l': agg_low, 'c': agg_close, 'v': agg_volume
-        }
-        self.agg_kline_data_deque.append(aggregated_kline_data)
-
-        if self.on_status_update:
-            self.on_status_update(f"[GoldenStrategy] New {self.strategy_timeframe_str} bar: O:{agg_open:.2f} H:{agg_high:.2f} L:{agg_low:.2f} C:{agg_close:.2f} V:{agg_volume:.2f} @ {bar_start_time_dt.strftime('%Y-%m-%d %H:%M:%S UTC')}")
-
-        self._run_strategy_on_aggregated_data()
+    def _get_daily_pivots(self):
+        """
+        Returns analyze_pivot_points() for the aggregated bars, recomputed only when its inputs change.
+        Pivots come from the previous UTC day's bars still held in the ring, so they are fixed by the
+        current day and the first previous-day bar in the window.
+        """
+        bar_times_ms = self.agg_klines.timestamps()
+        day_start_ms = int(bar_times_ms[-1]) - int(bar_times_ms[-1]) % MS_PER_DAY
+        first_prev_day_bar_ms = max(int(bar_times_ms[0]), day_start_ms - MS_PER_DAY)
+        cache_key = (day_start_ms, min(first_prev_day_bar_ms, day_start_ms))
+        if cache_key != self._pivot_cache_key:
+            self._pivot_cache_result = pivot_points.analyze_pivot_points(self.agg_klines.as_dict(), self.on_status_update)
+            self._pivot_cache_key = cache_key
+        return self._pivot_cache_result
 
     def _run_strategy_on_aggregated_data(self):
-        min_agg_bars_for_strategy = max(
-            (settings.MACD_LONG_PERIOD + settings.MACD_SIGNAL_PERIOD),
-            settings.RSI_PERIOD,
-            settings.SUPERTREND_ATR_PERIOD,
-            settings.KDJ_N_PERIOD,
-            settings.ATR_PERIOD
-        ) + 5
-
-        if len(self.agg_close_prices) < min_agg_bars_for_strategy:
-            status_msg_waiting = f"[GoldenStrategy] Collecting more AGGREGATED bars... ({len(self.agg_close_prices)}/{min_agg_bars_for_strategy}) for {self.strategy_timeframe_str} timeframe"
-            if self.on_status_update:
-                self.on_status_update(status_msg_waiting)
+        min_agg_bars_for_strategy = self.min_agg_bars_for_strategy
+        agg_bar_count = len(self.agg_klines)
+        if agg_bar_count < min_agg_bars_for_strategy:
             if not self.is_historical_fill_active:
+                if self.on_status_update:
+                    self.on_status_update(f"[GoldenStrategy] Collecting more AGGREGATED bars... ({agg_bar_count}/{min_agg_bars_for_strategy}) for {self.strategy_timeframe_str} timeframe")
                 if self.on_indicators_update:
                     self.on_indicators_update({
                         'timeframe': self.strategy_timeframe_str,
-                        'status': f"Waiting for {min_agg_bars_for_strategy - len(self.agg_close_prices)} more '{self.strategy_timeframe_str}' bars..."
+                        'status': f"Waiting for {min_agg_bars_for_strategy - agg_bar_count} more '{self.strategy_timeframe_str}' bars..."
                     })
                 if self.on_signal_update:
                     self.on_signal_update(f"Waiting for data on {self.strategy_timeframe_str}...")
-                if self.on_chart_update: self._trigger_provisional_chart_update()
+                # Charts are only published from the ingest thread (which already sends one per live kline), never the worker
+                if self.on_chart_update and threading.current_thread() is not self._signal_worker:
+                    self._trigger_provisional_chart_update()
+            return
+
+        if self.is_historical_fill_active:
+            # Nothing below is published during the historical fill and no state depends on it:
+            # indicator states were already advanced when the bar was finalized, and main.py
+            # reruns this method for the last bar once the fill is over.
             return
 
         # --- Chart update for completed bars (now handled by provisional or final update from main) ---
-        # The old block for chart update based *only* on agg_kline_data_deque is removed.
+        # The old block for chart update based *only* on completed aggregated bars is removed.
         # Provisional updates handle live, and main.py's call after historical fill handles the one-off update.
         # If a chart update is desired *after* indicators for a completed bar are calculated (live),
         # _trigger_provisional_chart_update can be called here again.
         # For now, the most frequent update is from _process_incoming_kline.
 
-        close_series = pd.Series(list(self.agg_close_prices))
-        high_series = pd.Series(list(self.agg_high_prices))
-        low_series = pd.Series(list(self.agg_low_prices))
-        historical_agg_df_for_analysis = pd.DataFrame(list(self.agg_kline_data_deque))
-
-        macd_data = calculator.calculate_macd(close_series, short_period=settings.MACD_SHORT_PERIOD, long_period=settings.MACD_LONG_PERIOD, signal_period=settings.MACD_SIGNAL_PERIOD)
-        rsi_data = calculator.calculate_rsi(close_series, period=settings.RSI_PERIOD)
-        supertrend_data = calculator.calculate_supertrend(high_series, low_series, close_series, atr_period=settings.ATR_PERIOD, atr_multiplier=settings.SUPERTREND_MULTIPLIER)
-        kdj_data = calculator.calculate_kdj(high_series, low_series, close_series, n_period=settings.KDJ_N_PERIOD, m1_period=settings.KDJ_M1_PERIOD, m2_period=settings.KDJ_M2_PERIOD)
-        sar_data = calculator.calculate_sar(high_series, low_series, initial_af=settings.SAR_INITIAL_AF, max_af=settings.SAR_MAX_AF, af_increment=settings.SAR_AF_INCREMENT)
-        fractal_data = calculator.calculate_williams_fractal(high_series, low_series, window=settings.FRACTAL_WINDOW)
-        momentum_data = calculator.calculate_momentum(close_series, period=settings.MOMENTUM_PERIOD)
-        atr_series = calculator.calculate_atr(high_series, low_series, close_series, period=settings.ATR_PERIOD)
-        latest_atr_val = atr_series.iloc[-1] if atr_series is not None and not atr_series.empty and not pd.isna(atr_series.iloc[-1]) else None
+        # Recursive indicators were advanced incrementally when the bar was finalized
+        macd_data = self.latest_indicators.get('macd')
+        rsi_data = self.latest_indicators.get('rsi')
+        supertrend_data = self.latest_indicators.get('supertrend')
+        kdj_data = self.latest_indicators.get('kdj')
+        sar_data = self.latest_indicators.get('sar')
+        latest_atr_val = self.latest_indicators.get('atr')
 
         if self.on_indicators_update and not self.is_historical_fill_active:
             indicator_gui_data = {
@@ -207,8 +416,17 @@ class GoldenStrategy:
                 indicator_gui_data['ST_VAL'] = supertrend_data.get('last_trend', 'N/A')
             self.on_indicators_update(indicator_gui_data)
 
-        fib_analysis_result = fibonacci_analysis.analyze(self.agg_kline_data_deque, self.on_status_update)
-        pivot_points_result = pivot_points.analyze_pivot_points(historical_agg_df_for_analysis, self.on_status_update)
+        if not (self.on_signal_update or self.on_status_update):
+            # Everything below only feeds the signal and status callbacks
+            return
+
+        agg_columns = self.agg_klines.as_dict()
+        # Fractals and momentum only look at the last few bars, so they are read straight off the window
+        fractal_data = calculator.calculate_williams_fractal(agg_columns['h'], agg_columns['l'], window=settings.FRACTAL_WINDOW)
+        momentum_data = calculator.calculate_momentum(agg_columns['c'], period=settings.MOMENTUM_PERIOD)
+
+        fib_analysis_result = self.fib_swing_detector.analyze(self.on_status_update)
+        pivot_points_result = self._get_daily_pivots()
         if not pivot_points_result or not pivot_points_result.get('daily_pivots'):
             if self.on_status_update:
                 status_msg = pivot_points_result.get('status', 'Pivot calculation failed or returned no data.') if pivot_points_result else 'Pivot analysis returned None.'
@@ -218,53 +436,55 @@ class GoldenStrategy:
         liquidity_info_for_signal = self.latest_liquidity_analysis
 
         signal = self._generate_signal(
-            current_kline=self.agg_kline_data_deque[-1],
-            indicators={
-                'macd': macd_data, 'rsi': rsi_data, 'supertrend': supertrend_data,
-                'kdj': kdj_data, 'sar': sar_data, 'fractal': fractal_data,
-                'momentum': momentum_data, 'atr': latest_atr_val
-            },
-            analysis={
-                'fibonacci': fib_analysis_result,
-                'pivots': pivot_points_result,
-                'liquidity': liquidity_info_for_signal # Use order book derived liquidity
-            }
+            current_kline={k: values[-1] for k, values in agg_columns.items()},
+            indicators=IndicatorSnapshot(
+                macd=macd_data, rsi=rsi_data, supertrend=supertrend_data,
+                kdj=kdj_data, sar=sar_data, fractal=fractal_data,
+                momentum=momentum_data, atr=latest_atr_val
+            ),
+            analysis=AnalysisSnapshot(
+                fibonacci=fib_analysis_result,
+                pivots=pivot_points_result,
+                liquidity=liquidity_info_for_signal # Use order book derived liquidity
+            )
         )
 
         # --- Process Signal Output ---
         if not self.is_historical_fill_active: # Only send updates for live data or final historical update
             if signal and self.on_signal_update:
-                signal_type = signal.get('type')
+                signal_type = signal.type
                 if signal_type in ["LONG", "SHORT"]:
-                    tp_val = signal.get('tp')
-                    sl_val = signal.get('sl')
-                    price_val = signal.get('price')
+                    tp_val = signal.tp
+                    sl_val = signal.sl
+                    price_val = signal.price
                     tp_info = f", TP: {tp_val:.2f}" if tp_val is not None else ""
                     sl_info = f", SL: {sl_val:.2f}" if sl_val is not None else ""
                     price_info = f" @ {price_val:.2f}" if price_val is not None else ""
                     self.on_signal_update(f"({self.strategy_timeframe_str}) {signal_type}{price_info}{tp_info}{sl_info}")
-                    logger.info(f"({self.strategy_timeframe_str}) Generated Trade Signal: {signal}")
+                    logger.info("(%s) Generated Trade Signal: %s", self.strategy_timeframe_str, signal) # Lazy: the dict is only formatted if INFO is enabled
                 elif signal_type == 'CONSOLIDATION_INFO':
-                    long_p = signal.get('long_perc', 0.0)
-                    short_p = signal.get('short_perc', 0.0)
-                    debug_states_for_log = signal.get('debug_states', {})
+                    long_p = signal.long_perc
+                    short_p = signal.short_perc
                     self.on_signal_update(f"({self.strategy_timeframe_str}) Consolidation: LONG {long_p:.0f}% | SHORT {short_p:.0f}%")
-                    logger.debug(f"[GoldenStrategy] ({self.strategy_timeframe_str}) Consolidation Info: Long {long_p:.0f}%, Short {short_p:.0f}%. States: {debug_states_for_log}")
+                    logger.debug("[GoldenStrategy] (%s) Consolidation Info: Long %.0f%%, Short %.0f%%. States: %s",
+                                 self.strategy_timeframe_str, long_p, short_p, signal.debug_states)
                 else: # Signal is None or unrecognized type
                     self.on_signal_update(f"({self.strategy_timeframe_str}) No specific signal / Awaiting conditions")
             elif self.on_signal_update and not self.is_historical_fill_active: # signal is None
                 self.on_signal_update(f"({self.strategy_timeframe_str}) No signal data returned by strategy")
 
         # Status update if no actual trade signal was generated
-        if not (signal and signal.get('type') in ["LONG", "SHORT"]):
+        if not (signal and signal.type in ["LONG", "SHORT"]):
             if self.on_status_update and not self.is_historical_fill_active:
                 self.on_status_update(f"[GoldenStrategy] ({self.strategy_timeframe_str}) No *trade* signal generated on this bar.")
 
     def process_order_book_update(self, order_book_snapshot):
         """ Processes new order book data and triggers liquidity analysis. """
-        logger.debug(f"[GoldenStrategy] process_order_book_update received snapshot. "
-                   f"Top Bid: {order_book_snapshot['bids'][0] if orderbook_snapshot and orderbook_snapshot.get('bids') else 'N/A'}, "
-                   f"Top Ask: {orderbook_snapshot['asks'][0] if orderbook_snapshot and orderbook_snapshot.get('asks') else 'N/A'}")
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        if debug_enabled:
+            logger.debug(f"[GoldenStrategy] process_order_book_update received snapshot. "
+                       f"Top Bid: {order_book_snapshot['bids'][0] if order_book_snapshot and order_book_snapshot.get('bids') else 'N/A'}, "
+                       f"Top Ask: {order_book_snapshot['asks'][0] if order_book_snapshot and order_book_snapshot.get('asks') else 'N/A'}")
         self.latest_order_book_snapshot = order_book_snapshot
         # logger.debug(f"[GoldenStrategy] Order book snapshot received. Top bid: {orderbook_snapshot['bids'][0] if order_book_snapshot.get('bids') else 'N/A'}")
 
@@ -275,17 +495,88 @@ class GoldenStrategy:
             settings,
             self.on_status_update
         )
-        logger.debug(f"[GoldenStrategy] Liquidity analysis result: "
-                   f"Sig Bids: {len(self.latest_liquidity_analysis.get('significant_bids',[])) if self.latest_liquidity_analysis else 'N/A'}, "
-                   f"Sig Asks: {len(self.latest_liquidity_analysis.get('significant_asks',[])) if self.latest_liquidity_analysis else 'N/A'}")
+        if debug_enabled:
+            logger.debug(f"[GoldenStrategy] Liquidity analysis result: "
+                       f"Sig Bids: {len(self.latest_liquidity_analysis.get('significant_bids',[])) if self.latest_liquidity_analysis else 'N/A'}, "
+                       f"Sig Asks: {len(self.latest_liquidity_analysis.get('significant_asks',[])) if self.latest_liquidity_analysis else 'N/A'}")
 
-        logger.debug(f"[GoldenStrategy] Calling on_liquidity_update_callback with latest_liquidity_analysis.")
+        logger.debug("[GoldenStrategy] Calling on_liquidity_update_callback with latest_liquidity_analysis.")
         if self.on_liquidity_update_callback and not self.is_historical_fill_active: # Assuming OB updates are live only
             self.on_liquidity_update_callback(self.latest_liquidity_analysis)
 
     def process_new_kline(self, kline_data):
         self._process_incoming_kline(kline_data)
 
+    def process_batch(self, klines):
+        """
+        Replays a sequence of base klines (e.g., a historical fill or a backtest) in one call.
+        Runs with the historical-fill behaviour: bars are aggregated and indicator states advanced,
+        but no per-kline chart updates, analysis or signal callbacks. The previous fill flag is
+        restored afterwards; call _run_strategy_on_aggregated_data() to publish the final state.
+        Returns the number of klines processed.
+        """
+        if not isinstance(klines, (list, tuple)):
+            klines = list(klines)
+        was_historical_fill_active = self.is_historical_fill_active
+        self.is_historical_fill_active = True
+        try:
+            try:
+                t = np.fromiter((int(k['t']) for k in klines), dtype=np.int64, count=len(klines))
+                ohlcv = [np.fromiter((float(k[field]) for k in klines), dtype=np.float64, count=len(klines))
+                         for field in ('o', 'h', 'l', 'c', 'v')]
+            except (KeyError, ValueError):
+                # Kline-by-kline replay logs and skips the invalid klines
+                for kline_data in klines:
+                    self._process_incoming_kline(kline_data)
+            else:
+                self._aggregate_kline_batch(t, *ohlcv)
+        finally:
+            self.is_historical_fill_active = was_historical_fill_active
+        return len(klines)
+
+    def _aggregate_kline_batch(self, t, o, h, l, c, v):
+        """
+        Folds parsed kline columns into bars with one reduction per column instead of one Python
+        step per kline. Gives the same bars as feeding the klines to _process_incoming_kline in order.
+        """
+        n = len(t)
+        if not n:
+            return
+        # The raw ring only keeps its newest `capacity` klines
+        for i in range(max(0, n - self.raw_klines.capacity), n):
+            self.raw_klines.append(int(t[i]), o[i], h[i], l[i], c[i], v[i])
+
+        bar_starts = t - t % self.timeframe_ms
+        if self._cur_bar_start_ms is not None:
+            bar_starts_seen = np.maximum.accumulate(np.maximum(bar_starts, self._cur_bar_start_ms))
+        else:
+            bar_starts_seen = np.maximum.accumulate(bar_starts)
+        # A kline behind the newest bar seen so far belongs to a finalized bar and is dropped
+        kept = np.flatnonzero(bar_starts == bar_starts_seen)
+        if len(kept) < n:
+            logger.debug("[GoldenStrategy] Ignoring %d late klines for finalized bars.", n - len(kept))
+            bar_starts, o, h, l, c, v = bar_starts[kept], o[kept], h[kept], l[kept], c[kept], v[kept]
+
+        new_bar = np.empty(len(bar_starts), dtype=bool)
+        new_bar[0] = True
+        np.not_equal(bar_starts[1:], bar_starts[:-1], out=new_bar[1:])
+        starts = np.flatnonzero(new_bar)
+        ends = np.append(starts[1:], len(bar_starts))
+        highs = np.maximum.reduceat(h, starts)
+        lows = np.minimum.reduceat(l, starts)
+
+        for bar_start_ms, start, end, bar_high, bar_low in zip(bar_starts[starts].tolist(), starts.tolist(), ends.tolist(), highs.tolist(), lows.tolist()):
+            if bar_start_ms == self._cur_bar_start_ms:
+                # The batch continues the forming bar
+                if bar_high > self._cur_high: self._cur_high = bar_high
+                if bar_low < self._cur_low: self._cur_low = bar_low
+                self._cur_close = float(c[end - 1])
+                # Accumulate in kline order so the volume matches the per-kline running sum exactly
+                self._cur_volume = float(np.add.accumulate(np.concatenate(((self._cur_volume,), v[start:end])))[-1])
+            else:
+                self._start_bar(bar_start_ms, float(o[start]), bar_high, bar_low, float(c[end - 1]),
+                                float(np.add.accumulate(v[start:end])[-1]))
+
     # --- Method for Live Chart Update ---
     def _trigger_provisional_chart_update(self):
         """
@@ -295,53 +586,32 @@ class GoldenStrategy:
         if not self.on_chart_update: # Only proceed if callback is set
             return
 
-        chart_klines_dicts = list(self.agg_kline_data_deque)
+        max_chart_bars = getattr(settings, 'CHART_MAX_AGG_BARS_DISPLAY', 100)
+        has_provisional_bar = self._cur_bar_start_ms is not None
+        # Only the completed bars the chart can show next to the provisional one, straight from the ring's column views
+        shown = slice(max(0, len(self.agg_klines) - (max_chart_bars - has_provisional_bar)), None)
+        bar_times_ms = self.agg_klines.timestamps()[shown]
+        bar_values = self.agg_klines.values()[:, shown]
 
-        if self.current_agg_kline_buffer and self.last_agg_bar_start_time is not None:
-            try:
-                prov_bar = {
-                    'ts_datetime': self.last_agg_bar_start_time,
-                    'o': self.current_agg_kline_buffer[0]['o'],
-                    'h': max(k['h'] for k in self.current_agg_kline_buffer),
-                    'l': min(k['l'] for k in self.current_agg_kline_buffer),
-                    'c': self.current_agg_kline_buffer[-1]['c'],
-                    'v': sum(k['v'] for k in self.current_agg_kline_buffer)
-                }
-                chart_klines_dicts.append(prov_bar)
-            except (IndexError, KeyError, TypeError) as e:
-                logger.warning(f"[GoldenStrategy] Could not form provisional bar for chart: {e}. Buffer size: {len(self.current_agg_kline_buffer)}")
-
-        if not chart_klines_dicts:
+        if has_provisional_bar:
+            prov_bar = (self._cur_open, self._cur_high, self._cur_low, self._cur_close, self._cur_volume)
+            bar_times_ms = np.append(bar_times_ms, self._cur_bar_start_ms)
+            bar_values = np.column_stack((bar_values, prov_bar))
+
+        if not len(bar_times_ms):
             self.on_chart_update(pd.DataFrame())
             return
 
-        chart_df_data = []
-        for kline_dict in chart_klines_dicts:
-            chart_df_data.append({
-                'Timestamp': kline_dict.get('ts_datetime'),
-                'Open': kline_dict.get('o'),
-                'High': kline_dict.get('h'),
-                'Low': kline_dict.get('l'),
-                'Close': kline_dict.get('c'),
-                'Volume': kline_dict.get('v')
-            })
-
         try:
-            chart_df = pd.DataFrame(chart_df_data)
-            if chart_df.empty or 'Timestamp' not in chart_df.columns or chart_df['Timestamp'].isnull().all():
-                self.on_chart_update(pd.DataFrame())
-                return
-            chart_df.set_index('Timestamp', inplace=True)
-            for col in ['Open', 'High', 'Low', 'Close', 'Volume']:
-                chart_df[col] = pd.to_numeric(chart_df[col], errors='coerce')
-            chart_df.dropna(subset=['Open', 'High', 'Low', 'Close'], inplace=True)
-
-            if not chart_df.empty:
-                max_chart_bars = getattr(settings, 'CHART_MAX_AGG_BARS_DISPLAY', 100)
-                chart_df_to_send = chart_df.iloc[-max_chart_bars:] if len(chart_df) > max_chart_bars else chart_df
-                self.on_chart_update(chart_df_to_send)
-            else:
-                self.on_chart_update(pd.DataFrame())
+            chart_df = pd.DataFrame(
+                {'Open': bar_values[0], 'High': bar_values[1], 'Low': bar_values[2], 'Close': bar_values[3], 'Volume': bar_values[4]},
+                index=pd.to_datetime(bar_times_ms, unit='ms', utc=True).rename('Timestamp')
+            )
+            # Columns are float64 by construction; only a NaN price (e.g., parsed from a bad kline) needs dropping
+            if np.isnan(bar_values[:4]).any():
+                chart_df.dropna(subset=['Open', 'High', 'Low', 'Close'], inplace=True)
+
+            self.on_chart_update(chart_df if not chart_df.empty else pd.DataFrame())
 
         except Exception as e_chart_df_prov:
             logger.error(f'[GoldenStrategy] Error preparing DataFrame for provisional chart: {e_chart_df_prov}', exc_info=False)
@@ -386,7 +656,7 @@ class GoldenStrategy:
         if not macd_data or macd_data.get('macd') is None or macd_data.get('signal') is None or macd_data.get('histogram') is None:
             return 'NEUTRAL'
         macd_line, signal_line, histogram = macd_data['macd'], macd_data['signal'], macd_data['histogram']
-        hist_strength_threshold = getattr(settings, 'MACD_HIST_STRENGTH_THRESHOLD', 0.0001)
+        hist_strength_threshold = self._c.macd_hist_strength_threshold
 
         if macd_line > signal_line and histogram > 0:
             return 'STRONG_BULLISH' if histogram > hist_strength_threshold else 'BULLISH'
@@ -398,10 +668,8 @@ class GoldenStrategy:
 
     def _assess_rsi(self, rsi_data):
         if rsi_data is None: return 'NEUTRAL'
-        ob = settings.STRATEGY_RSI_OVERBOUGHT
-        os = settings.STRATEGY_RSI_OVERSOLD
-        bc = getattr(settings, 'RSI_BULLISH_CONFIRM', 55)
-        sc = getattr(settings, 'RSI_BEARISH_CONFIRM', 45)
+        c = self._c
+        ob, os, bc, sc = c.rsi_overbought, c.rsi_oversold, c.rsi_bullish_confirm, c.rsi_bearish_confirm
         if rsi_data >= ob: return 'OVERBOUGHT'
         if rsi_data <= os: return 'OVERSOLD'
         if rsi_data >= bc: return 'BULLISH'
@@ -412,10 +680,9 @@ class GoldenStrategy:
         if not kdj_data or kdj_data.get('K') is None or kdj_data.get('D') is None or kdj_data.get('J') is None:
             return 'NEUTRAL'
         k, d, j = kdj_data['K'], kdj_data['D'], kdj_data['J']
-        j_overbought = getattr(settings, 'KDJ_J_OVERBOUGHT', 90)
-        j_oversold = getattr(settings, 'KDJ_J_OVERSOLD', 10)
-        k_confirm_ob = getattr(settings, 'KDJ_K_CONFIRM_OVERBOUGHT', 80)
-        k_confirm_os = getattr(settings, 'KDJ_K_CONFIRM_OVERSOLD', 20)
+        c = self._c
+        j_overbought, j_oversold = c.kdj_j_overbought, c.kdj_j_oversold
+        k_confirm_ob, k_confirm_os = c.kdj_k_confirm_overbought, c.kdj_k_confirm_oversold
 
         if j > j_overbought or (j > k_confirm_ob and k > k_confirm_ob): return 'OVERBOUGHT'
         if j < j_oversold or (j < k_confirm_os and k < k_confirm_os): return 'OVERSOLD'
@@ -434,76 +701,95 @@ class GoldenStrategy:
     def _assess_sr_levels(self, current_price, current_low, current_high, pivots, fib_analysis, liquidity_zones):
         method_body_indent = "        " # Assuming 8 spaces for method body based on typical class structure
         if current_price is None: return 'NEUTRAL_SR'
-        prox_factor = getattr(settings, 'SR_PROXIMITY_FACTOR', 0.003)
+        c = self._c
+        # Proximity bands are precomputed multipliers (see refresh_settings), one multiply per level check
+        support_band, resistance_band = c.sr_support_band, c.sr_resistance_band
 
         # 1. Check Pivots
-        if pivots and pivots.get('daily_pivots'):
-            s1 = pivots['daily_pivots'].get('S1')
-            r1 = pivots['daily_pivots'].get('R1')
-            if s1 and current_low <= s1 * (1 + prox_factor) and current_price > s1:
-                logger.debug(f"[SR_Assess] Bounce detected off Pivot S1: {s1:.2f}")
+        daily_pivots = pivots.get('daily_pivots') if pivots else None
+        if daily_pivots:
+            s1 = daily_pivots.get('S1')
+            r1 = daily_pivots.get('R1')
+            if s1 and current_low <= s1 * support_band and current_price > s1:
+                logger.debug("[SR_Assess] Bounce detected off Pivot S1: %.2f", s1)
                 return 'BOUNCE_SUPPORT_PIVOT'
-            if r1 and current_high >= r1 * (1 - prox_factor) and current_price < r1:
-                logger.debug(f"[SR_Assess] Rejection detected at Pivot R1: {r1:.2f}")
+            if r1 and current_high >= r1 * resistance_band and current_price < r1:
+                logger.debug("[SR_Assess] Rejection detected at Pivot R1: %.2f", r1)
                 return 'REJECT_RESISTANCE_PIVOT'
             # Stronger conditions for breakout/breakdown (e.g. close beyond pivot)
-            if r1 and current_price > r1 * (1 + prox_factor / 2): # Closed clearly above R1
-                logger.debug(f"[SR_Assess] Breakout above Pivot R1: {r1:.2f}")
+            if r1 and current_price > r1 * c.sr_breakout_band: # Closed clearly above R1
+                logger.debug("[SR_Assess] Breakout above Pivot R1: %.2f", r1)
                 return 'BREAKOUT_ABOVE_R1_PIVOT'
-            if s1 and current_price < s1 * (1 - prox_factor / 2): # Closed clearly below S1
-                logger.debug(f"[SR_Assess] Breakdown below Pivot S1: {s1:.2f}")
+            if s1 and current_price < s1 * c.sr_breakdown_band: # Closed clearly below S1
+                logger.debug("[SR_Assess] Breakdown below Pivot S1: %.2f", s1)
                 return 'BREAKDOWN_BELOW_S1_PIVOT'
 
         # 2. Check Fibonacci Levels
         # Assuming 'retracement_levels_from_B' is the correct key based on fibonacci_analysis.py
         if fib_analysis and fib_analysis.get('retracement_levels_from_B'):
             levels = fib_analysis['retracement_levels_from_B']
+            trend_type = fib_analysis.get('trend_type')
             for fib_val_key in [0.5, 0.618]: # Check common levels
                 fib_level_price = levels.get(fib_val_key)
                 if fib_level_price:
-                    if fib_analysis.get('trend_type') == 'uptrend' and current_low <= fib_level_price * (1 + prox_factor) and current_price > fib_level_price:
-                        logger.debug(f"[SR_Assess] Bounce detected off Fib {fib_val_key*100:.1f}% support: {fib_level_price:.2f}")
+                    if trend_type == 'uptrend' and current_low <= fib_level_price * support_band and current_price > fib_level_price:
+                        logger.debug("[SR_Assess] Bounce detected off Fib %.1f%% support: %.2f", fib_val_key * 100, fib_level_price)
                         return 'BOUNCE_SUPPORT_FIB'
-                    if fib_analysis.get('trend_type') == 'downtrend' and current_high >= fib_level_price * (1 - prox_factor) and current_price < fib_level_price:
-                        logger.debug(f"[SR_Assess] Rejection detected at Fib {fib_val_key*100:.1f}% resistance: {fib_level_price:.2f}")
+                    if trend_type == 'downtrend' and current_high >= fib_level_price * resistance_band and current_price < fib_level_price:
+                        logger.debug("[SR_Assess] Rejection detected at Fib %.1f%% resistance: %.2f", fib_val_key * 100, fib_level_price)
                         return 'REJECT_RESISTANCE_FIB'
 
-        # Log received liquidity data before processing it
-        logger.debug(f"[SR_Assess] Assessing Order Book Liquidity. Received liquidity_zones type: {type(liquidity_zones)}. "
-                   f"Sig Bids: {len(liquidity_zones.get('significant_bids',[])) if isinstance(liquidity_zones, dict) else 'N/A Data'}, "
-                   f"Sig Asks: {len(liquidity_zones.get('significant_asks',[])) if isinstance(liquidity_zones, dict) else 'N/A Data'}")
+        # Log received liquidity data before processing it; the summary is only built when DEBUG is on
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"[SR_Assess] Assessing Order Book Liquidity. Received liquidity_zones type: {type(liquidity_zones)}. "
+                       f"Sig Bids: {len(liquidity_zones.get('significant_bids',[])) if isinstance(liquidity_zones, dict) else 'N/A Data'}, "
+                       f"Sig Asks: {len(liquidity_zones.get('significant_asks',[])) if isinstance(liquidity_zones, dict) else 'N/A Data'}")
         # 3. Check Order Book Liquidity Levels (New Logic)
         # 'liquidity_zones' argument now contains the result from order-book based liquidity_analysis.analyze()
         if liquidity_zones and isinstance(liquidity_zones, dict):
             significant_bids = liquidity_zones.get('significant_bids', [])
             significant_asks = liquidity_zones.get('significant_asks', [])
 
-            # Check top N significant bids (e.g., top 1-2 from liquidity_analysis which sorts by qty)
-            for bid_info in significant_bids[:getattr(settings, 'LIQUIDITY_LEVELS_TO_CHECK', 2)] :
-                bid_price = bid_info['price']
-                if current_low <= bid_price * (1 + prox_factor) and current_price > bid_price:
-                    logger.debug(f"[SR_Assess] Bounce detected off OB liquidity (bid): {bid_price:.2f} (Qty: {bid_info['qty']})")
-                    return 'BOUNCE_SUPPORT_LIQ'
+            levels_to_check = c.liquidity_levels_to_check
+
+            # Check top N significant bids (e.g., top 1-2 from liquidity_analysis which sorts by qty), all at once
+            bid_prices = self._liquidity_prices(liquidity_zones, 'significant_bids', 'significant_bid_prices')[:levels_to_check]
+            bounces = (current_low <= bid_prices * support_band) & (current_price > bid_prices)
+            if bounces.any():
+                bid_info = significant_bids[int(bounces.argmax())] # First hit, as the levels are ranked
+                logger.debug("[SR_Assess] Bounce detected off OB liquidity (bid): %.2f (Qty: %s)", bid_info['price'], bid_info['qty'])
+                return 'BOUNCE_SUPPORT_LIQ'
 
             # Check top N significant asks
-            for ask_info in significant_asks[:getattr(settings, 'LIQUIDITY_LEVELS_TO_CHECK', 2)]:
-                ask_price = ask_info['price']
-                if current_high >= ask_price * (1 - prox_factor) and current_price < ask_price:
-                    logger.debug(f"[SR_Assess] Rejection detected at OB liquidity (ask): {ask_price:.2f} (Qty: {ask_info['qty']})")
-                    return 'REJECT_RESISTANCE_LIQ'
+            ask_prices = self._liquidity_prices(liquidity_zones, 'significant_asks', 'significant_ask_prices')[:levels_to_check]
+            rejections = (current_high >= ask_prices * resistance_band) & (current_price < ask_prices)
+            if rejections.any():
+                ask_info = significant_asks[int(rejections.argmax())]
+                logger.debug("[SR_Assess] Rejection detected at OB liquidity (ask): %.2f (Qty: %s)", ask_info['price'], ask_info['qty'])
+                return 'REJECT_RESISTANCE_LIQ'
 
         return 'NEUTRAL_SR' # Default if no specific S/R interaction found
 
-    def _assess_volume(self, current_agg_kline, agg_volume_series):
-        if current_agg_kline is None or not hasattr(agg_volume_series, 'mean') or agg_volume_series.empty: return 'NEUTRAL_VOLUME'
+    @staticmethod
+    def _liquidity_prices(liquidity_zones, levels_key, prices_key):
+        """ Prices of one side's significant levels as an ndarray, in the order liquidity_analysis ranked them. """
+        prices = liquidity_zones.get(prices_key)
+        if prices is None: # Results built without the price arrays
+            prices = np.array([level['price'] for level in liquidity_zones.get(levels_key, [])], dtype=float)
+        return prices
+
+    def _assess_volume(self, current_agg_kline, agg_volumes):
+        """ `agg_volumes` is the aggregated bars' volume column, oldest first (ring view, array or Series). """
+        if current_agg_kline is None or agg_volumes is None or len(agg_volumes) == 0: return 'NEUTRAL_VOLUME'
         current_vol = current_agg_kline.get('v')
-        if current_vol is None or len(agg_volume_series) < 5: return 'NEUTRAL_VOLUME'
+        if current_vol is None or len(agg_volumes) < 5: return 'NEUTRAL_VOLUME'
 
-        avg_vol_window = min(getattr(settings, 'VOLUME_AVG_PERIOD', 20), max(1, len(agg_volume_series)-1) )
-        avg_vol = agg_volume_series.rolling(window=avg_vol_window, min_periods=1).mean().iloc[-1]
+        avg_vol_window = min(self._c.volume_avg_period, max(1, len(agg_volumes)-1) )
+        # Only the newest window's mean is needed, so no rolling pass over the whole history
+        avg_vol = np.asarray(agg_volumes)[-avg_vol_window:].mean()
 
-        vol_high_multiplier = getattr(settings, 'VOLUME_HIGH_MULTIPLIER', 1.5)
-        vol_low_multiplier = getattr(settings, 'VOLUME_LOW_MULTIPLIER', 0.7)
+        vol_high_multiplier = self._c.volume_high_multiplier
+        vol_low_multiplier = self._c.volume_low_multiplier
 
         if avg_vol == 0 :
             return 'HIGH_VOLUME' if current_vol > 0 else 'NEUTRAL_VOLUME'
@@ -512,133 +798,46 @@ class GoldenStrategy:
         if current_vol < avg_vol * vol_low_multiplier: return 'LOW_VOLUME'
         return 'AVERAGE_VOLUME'
 
-    def _calculate_signal_consolidation(self, assessed_states_dict, target_signal_type):
-        """Calculates a consolidation percentage towards a target signal type."""
-        current_score = 0
-        max_score = 0
-
-        trend_state = assessed_states_dict.get('trend', 'NEUTRAL_TREND')
-        macd_state = assessed_states_dict.get('macd', 'NEUTRAL')
-        rsi_state = assessed_states_dict.get('rsi', 'NEUTRAL')
-        kdj_state = assessed_states_dict.get('kdj', 'NEUTRAL')
-        fractal_assessment = assessed_states_dict.get('fractal', 'NEUTRAL')
-        sr_level_assessment = assessed_states_dict.get('sr', 'NEUTRAL_SR')
-        volume_assessment = assessed_states_dict.get('volume', 'NEUTRAL_VOLUME')
-
-        if target_signal_type == "LONG":
-            max_score += 2 # Trend
-            if trend_state == 'STRONG_BULLISH_TREND': current_score += 2
-            elif trend_state == 'BULLISH_TREND_ST' or trend_state == 'BULLISH_TREND_SAR': current_score += 1
-            max_score += 2 # MACD
-            if macd_state == 'STRONG_BULLISH': current_score += 2
-            elif macd_state == 'BULLISH': current_score += 1
-            max_score += 1 # RSI
-            if rsi_state == 'BULLISH': current_score += 1
-            max_score += 1 # KDJ
-            if kdj_state == 'BULLISH' or kdj_state == 'OVERSOLD': current_score += 1
-            max_score += 2 # S/R
-            if sr_level_assessment in ['BOUNCE_SUPPORT_PIVOT', 'BOUNCE_SUPPORT_FIB', 'BOUNCE_SUPPORT_LIQ', 'BREAKOUT_ABOVE_R1_PIVOT']: current_score += 2
-            max_score += 1 # Fractal
-            if fractal_assessment == 'BROKE_BEARISH_FRACTAL_UP': current_score += 1
-            max_score += 2 # Volume
-            if volume_assessment == 'HIGH_VOLUME': current_score += 2
-            elif volume_assessment == 'AVERAGE_VOLUME': current_score += 1
-        elif target_signal_type == "SHORT":
-            max_score += 2 # Trend
-            if trend_state == 'STRONG_BEARISH_TREND': current_score += 2
-            elif trend_state == 'BEARISH_TREND_ST' or trend_state == 'BEARISH_TREND_SAR': current_score += 1
-            max_score += 2 # MACD
-            if macd_state == 'STRONG_BEARISH': current_score += 2
-            elif macd_state == 'BEARISH': current_score += 1
-            max_score += 1 # RSI
-            if rsi_state == 'BEARISH': current_score += 1
-            max_score += 1 # KDJ
-            if kdj_state == 'BEARISH' or kdj_state == 'OVERBOUGHT': current_score += 1
-            max_score += 2 # S/R
-            if sr_level_assessment in ['REJECT_RESISTANCE_PIVOT', 'REJECT_RESISTANCE_FIB', 'REJECT_RESISTANCE_LIQ', 'BREAKDOWN_BELOW_S1_PIVOT']: current_score += 2
-            max_score += 1 # Fractal
-            if fractal_assessment == 'BROKE_BULLISH_FRACTAL_DOWN': current_score += 1
-            max_score += 2 # Volume
-            if volume_assessment == 'HIGH_VOLUME': current_score += 2
-            elif volume_assessment == 'AVERAGE_VOLUME': current_score += 1
-
-        if max_score == 0: return 0.0
-        return (current_score / max_score) * 100
-
     # --- End Signal Generation Helper Methods ---
 
     def _calculate_tp_sl(self, signal_type, entry_price, current_kline_low, current_kline_high, indicators, analysis):
         """ Helper to calculate TP and SL based on current logic. """
-        atr_value = indicators.get('atr')
-        pivots_data = analysis.get('pivots', {}).get('daily_pivots')
-
-        take_profit = None
-        stop_loss = None
-
-        price_buffer_factor = getattr(settings, 'SL_PRICE_BUFFER_ATR_FACTOR', 0.1)
+        atr_value = indicators.atr
+        c = self._c
 
-        # --- Stop Loss Calculation ---
-        sl_atr_defined = False
+        # --- Stop Loss / Take Profit: ATR multiples, or fixed-percentage fallbacks without a valid ATR ---
         if atr_value is not None and atr_value > 0:
-            sl_distance = settings.ATR_SL_MULTIPLIER * atr_value
-            price_buffer = atr_value * price_buffer_factor
-
-            if signal_type == "LONG":
-                sl_atr = entry_price - sl_distance
-                stop_loss = min(sl_atr, current_kline_low - price_buffer)
-            elif signal_type == "SHORT":
-                sl_atr = entry_price + sl_distance
-                stop_loss = max(sl_atr, current_kline_high + price_buffer)
-            sl_atr_defined = True
-
-        if not sl_atr_defined:
-            if signal_type == "LONG":
-                stop_loss = entry_price * (1 - settings.MIN_SL_FALLBACK_PERCENTAGE)
-            else: # SHORT
-                stop_loss = entry_price * (1 + settings.MIN_SL_FALLBACK_PERCENTAGE)
-
-        # --- Take Profit Calculation ---
-        tp_atr_defined = False
-        if atr_value is not None and atr_value > 0:
-            tp_distance = settings.ATR_TP_MULTIPLIER * atr_value
+            sl_distance = c.atr_sl_multiplier * atr_value
+            tp_distance = c.atr_tp_multiplier * atr_value
+            price_buffer = atr_value * c.sl_price_buffer_atr_factor
             if signal_type == "LONG":
+                stop_loss = min(entry_price - sl_distance, current_kline_low - price_buffer)
                 take_profit = entry_price + tp_distance
-            elif signal_type == "SHORT":
-                take_profit = entry_price - tp_distance
-            tp_atr_defined = True
-
-        if pivots_data:
-            if signal_type == "LONG" and pivots_data.get('R1'):
-                tp_pivot = pivots_data['R1']
-                if not tp_atr_defined or (tp_pivot > entry_price and tp_pivot < (take_profit if tp_atr_defined else float('inf'))):
-                    if take_profit is None or (tp_pivot < take_profit):
-                         pass
-            elif signal_type == "SHORT" and pivots_data.get('S1'):
-                tp_pivot = pivots_data['S1']
-                if not tp_atr_defined or (tp_pivot < entry_price and tp_pivot > (take_profit if tp_atr_defined else float('-inf'))):
-                         pass
-
-        if not tp_atr_defined and take_profit is None:
-            if signal_type == "LONG":
-                take_profit = entry_price * (1 + settings.MIN_TP_FALLBACK_PERCENTAGE)
             else: # SHORT
-                take_profit = entry_price * (1 - settings.MIN_TP_FALLBACK_PERCENTAGE)
+                stop_loss = max(entry_price + sl_distance, current_kline_high + price_buffer)
+                take_profit = entry_price - tp_distance
+        elif signal_type == "LONG":
+            stop_loss = entry_price * (1 - c.min_sl_fallback_percentage)
+            take_profit = entry_price * (1 + c.min_tp_fallback_percentage)
+        else: # SHORT
+            stop_loss = entry_price * (1 + c.min_sl_fallback_percentage)
+            take_profit = entry_price * (1 - c.min_tp_fallback_percentage)
 
         if signal_type == "LONG":
-            if take_profit <= entry_price: take_profit = entry_price * (1 + settings.MIN_TP_DISTANCE_PERCENTAGE)
-            if stop_loss >= entry_price: stop_loss = entry_price * (1 - settings.MIN_SL_DISTANCE_PERCENTAGE)
+            if take_profit <= entry_price: take_profit = entry_price * (1 + c.min_tp_distance_percentage)
+            if stop_loss >= entry_price: stop_loss = entry_price * (1 - c.min_sl_distance_percentage)
         elif signal_type == "SHORT":
-            if take_profit >= entry_price: take_profit = entry_price * (1 - settings.MIN_TP_DISTANCE_PERCENTAGE)
-            if stop_loss <= entry_price: stop_loss = entry_price * (1 + settings.MIN_SL_DISTANCE_PERCENTAGE)
+            if take_profit >= entry_price: take_profit = entry_price * (1 - c.min_tp_distance_percentage)
+            if stop_loss <= entry_price: stop_loss = entry_price * (1 + c.min_sl_distance_percentage)
 
-        if stop_loss is not None and take_profit is not None and stop_loss != entry_price:
+        if stop_loss != entry_price:
             reward_abs = abs(take_profit - entry_price)
             risk_abs = abs(entry_price - stop_loss)
             if risk_abs > 0:
                 current_rr = reward_abs / risk_abs
-                if current_rr < settings.MIN_RR_RATIO:
+                if current_rr < c.min_rr_ratio:
                     if self.on_status_update and not self.is_historical_fill_active:
-                        self.on_status_update(f"[StrategySignal] ({self.strategy_timeframe_str}) {signal_type} signal R/R ratio {current_rr:.2f} < min {settings.MIN_RR_RATIO}. TP={take_profit:.2f}, SL={stop_loss:.2f}. Signal invalidated.")
+                        self.on_status_update(f"[StrategySignal] ({self.strategy_timeframe_str}) {signal_type} signal R/R ratio {current_rr:.2f} < min {c.min_rr_ratio}. TP={take_profit:.2f}, SL={stop_loss:.2f}. Signal invalidated.")
                     return None, None
             else:
                 if self.on_status_update and not self.is_historical_fill_active:
@@ -652,23 +851,23 @@ class GoldenStrategy:
         """
         Refactored signal generation logic.
         Combines states from helper assessment methods to find confluence.
+        `indicators` is an IndicatorSnapshot and `analysis` an AnalysisSnapshot.
         """
         current_price = float(current_kline['c'])
         current_high = float(current_kline['h'])
         current_low = float(current_kline['l'])
 
-        trend_state = self._assess_trend_filters(indicators.get('supertrend'), indicators.get('sar'), current_price)
-        macd_state = self._assess_macd(indicators.get('macd'))
-        rsi_state = self._assess_rsi(indicators.get('rsi'))
-        kdj_state = self._assess_kdj(indicators.get('kdj'))
-        fractal_assessment = self._assess_fractals(indicators.get('fractal'), current_high, current_low)
+        trend_state = self._assess_trend_filters(indicators.supertrend, indicators.sar, current_price)
+        macd_state = self._assess_macd(indicators.macd)
+        rsi_state = self._assess_rsi(indicators.rsi)
+        kdj_state = self._assess_kdj(indicators.kdj)
+        fractal_assessment = self._assess_fractals(indicators.fractal, current_high, current_low)
         sr_level_assessment = self._assess_sr_levels(current_price, current_low, current_high,
-                                                     analysis.get('pivots'),
-                                                     analysis.get('fibonacci'),
-                                                     analysis.get('liquidity'))
+                                                     analysis.pivots,
+                                                     analysis.fibonacci,
+                                                     analysis.liquidity)
 
-        agg_volume_series = pd.Series(list(self.agg_volumes)) if self.agg_volumes else pd.Series([], dtype=float)
-        volume_assessment = self._assess_volume(current_kline, agg_volume_series)
+        volume_assessment = self._assess_volume(current_kline, self.agg_klines.column('v'))
 
         if self.on_status_update and not self.is_historical_fill_active:
             log_msg_parts = [
@@ -683,9 +882,9 @@ class GoldenStrategy:
             if (macd_state == 'STRONG_BULLISH' or macd_state == 'BULLISH') and \
                (rsi_state == 'BULLISH' and rsi_state != 'OVERBOUGHT') and \
                (kdj_state == 'BULLISH' or kdj_state == 'OVERSOLD'):
-                sr_confirms_long = sr_level_assessment in ['BOUNCE_SUPPORT_PIVOT', 'BOUNCE_SUPPORT_FIB', 'BOUNCE_SUPPORT_LIQ', 'BREAKOUT_ABOVE_R1_PIVOT']
+                sr_confirms_long = sr_level_assessment in LONG_SR_CONFIRMATIONS
                 fractal_confirms_long = fractal_assessment == 'BROKE_BEARISH_FRACTAL_UP'
-                volume_supports_move = volume_assessment in ['AVERAGE_VOLUME', 'HIGH_VOLUME']
+                volume_supports_move = volume_assessment in MOVE_SUPPORTING_VOLUMES
                 if sr_confirms_long and volume_supports_move:
                     is_long_signal = True
                     if self.on_status_update and not self.is_historical_fill_active: self.on_status_update(f"[StrategySignal] LONG Condition Met (Trend + Momentum + S/R_Bounce/Break + Volume). Fractal: {fractal_assessment}")
@@ -699,16 +898,16 @@ class GoldenStrategy:
             take_profit, stop_loss = self._calculate_tp_sl(signal_type, entry_price, current_low, current_high, indicators, analysis)
             if take_profit is not None and stop_loss is not None:
                 debug_states = { "trend": trend_state, "macd": macd_state, "rsi": rsi_state, "kdj": kdj_state, "fractal": fractal_assessment, "sr": sr_level_assessment, "volume": volume_assessment }
-                return {'type': signal_type, 'price': entry_price, 'tp': take_profit, 'sl': stop_loss, 'debug_states': debug_states}
+                return Signal(signal_type, price=entry_price, tp=take_profit, sl=stop_loss, debug_states=debug_states)
 
         is_short_signal = False
         if (trend_state == 'STRONG_BEARISH_TREND' or trend_state == 'BEARISH_TREND_ST'):
             if (macd_state == 'STRONG_BEARISH' or macd_state == 'BEARISH') and \
                (rsi_state == 'BEARISH' and rsi_state != 'OVERSOLD') and \
                (kdj_state == 'BEARISH' or kdj_state == 'OVERBOUGHT'):
-                sr_confirms_short = sr_level_assessment in ['REJECT_RESISTANCE_PIVOT', 'REJECT_RESISTANCE_FIB', 'REJECT_RESISTANCE_LIQ', 'BREAKDOWN_BELOW_S1_PIVOT']
+                sr_confirms_short = sr_level_assessment in SHORT_SR_CONFIRMATIONS
                 fractal_confirms_short = fractal_assessment == 'BROKE_BULLISH_FRACTAL_DOWN'
-                volume_supports_move = volume_assessment in ['AVERAGE_VOLUME', 'HIGH_VOLUME']
+                volume_supports_move = volume_assessment in MOVE_SUPPORTING_VOLUMES
                 if sr_confirms_short and volume_supports_move:
                     is_short_signal = True
                     if self.on_status_update and not self.is_historical_fill_active: self.on_status_update(f"[StrategySignal] SHORT Condition Met (Trend + Momentum + S/R_Rejection/Breakdown + Volume). Fractal: {fractal_assessment}")
@@ -722,16 +921,17 @@ class GoldenStrategy:
             take_profit, stop_loss = self._calculate_tp_sl(signal_type, entry_price, current_low, current_high, indicators, analysis)
             if take_profit is not None and stop_loss is not None:
                 debug_states = { "trend": trend_state, "macd": macd_state, "rsi": rsi_state, "kdj": kdj_state, "fractal": fractal_assessment, "sr": sr_level_assessment, "volume": volume_assessment }
-                return {'type': signal_type, 'price': entry_price, 'tp': take_profit, 'sl': stop_loss, 'debug_states': debug_states}
+                return Signal(signal_type, price=entry_price, tp=take_profit, sl=stop_loss, debug_states=debug_states)
 
         # Calculate consolidation percentages if no trade signal
         assessed_states_dict = {
             'trend': trend_state, 'macd': macd_state, 'rsi': rsi_state, 'kdj': kdj_state,
             'fractal': fractal_assessment, 'sr': sr_level_assessment, 'volume': volume_assessment
         }
-        long_consol_perc = self._calculate_signal_consolidation(assessed_states_dict, "LONG")
-        short_consol_perc = self._calculate_signal_consolidation(assessed_states_dict, "SHORT")
-        return {'type': 'CONSOLIDATION_INFO', 'long_perc': long_consol_perc, 'short_perc': short_consol_perc, 'debug_states': assessed_states_dict}
+        long_consol_perc, short_consol_perc = score_consolidation(
+            trend_state, macd_state, rsi_state, kdj_state, fractal_assessment, sr_level_assessment, volume_assessment
+        )
+        return Signal('CONSOLIDATION_INFO', long_perc=long_consol_perc, short_perc=short_consol_perc, debug_states=assessed_states_dict)
 
 
 if __name__ == '__main__':
@@ -792,5 +992,3 @@ if __name__ == '__main__':
     print("\nGoldenStrategy aggregation test finished.")
     settings.STRATEGY_TIMEFRAME = original_timeframe
     print(f"TEST: Restored STRATEGY_TIMEFRAME to {settings.STRATEGY_TIMEFRAME}.")
-
-[end of trading_bot/strategy/gold_strategy.py]
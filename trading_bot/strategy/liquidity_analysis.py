@@ -5,6 +5,21 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+def _book_side(levels):
+    """ Splits one side of the book ([[price, qty], ...]) into parallel (prices, qtys) float arrays. """
+    book = np.asarray(levels, dtype=np.float64).reshape(-1, 2)
+    return book[:, 0], book[:, 1]
+
+def _significant_levels(prices, qtys, qty_threshold):
+    """
+    Filters one side of the book to the levels with qty >= qty_threshold.
+    Returns (prices, qtys) ndarrays ranked by quantity, largest first; equal quantities keep book order.
+    """
+    mask = qtys >= qty_threshold
+    prices, qtys = prices[mask], qtys[mask]
+    order = np.argsort(-qtys, kind='stable')
+    return prices[order], qtys[order]
+
 def analyze(order_book_snapshot, settings, on_status_update=None): # Added settings
     """
     Analyzes order book snapshot to identify significant liquidity levels.
@@ -14,9 +29,10 @@ def analyze(order_book_snapshot, settings, on_status_update=None): # Added setti
     on_status_update: Callback for status messages.
     Returns: Dict with 'significant_bids': [{'price': p, 'qty': q}, ...], 'significant_asks': [...]
     """
-    logger.debug(f"[LiquidityAnalysisOB] Received snapshot. "
-               f"Bids: {len(order_book_snapshot.get('bids',[])) if order_book_snapshot else 'N/A'}, "
-               f"Asks: {len(order_book_snapshot.get('asks',[])) if order_book_snapshot else 'N/A'}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"[LiquidityAnalysisOB] Received snapshot. "
+                   f"Bids: {len(order_book_snapshot.get('bids',[])) if order_book_snapshot else 'N/A'}, "
+                   f"Asks: {len(order_book_snapshot.get('asks',[])) if order_book_snapshot else 'N/A'}")
     if on_status_update:
         on_status_update("[LiquidityAnalysisOB] Analyzing order book snapshot...")
 
@@ -25,27 +41,33 @@ def analyze(order_book_snapshot, settings, on_status_update=None): # Added setti
         return {"status": "Invalid order book data.", "significant_bids": [], "significant_asks": []}
 
     # DataFetcher's get_order_book_snapshot provides sorted lists of [price_float, qty_float]
-    bids = order_book_snapshot.get('bids', []) # List of [price, qty]
-    asks = order_book_snapshot.get('asks', []) # List of [price, qty]
+    bid_prices, bid_qtys = _book_side(order_book_snapshot.get('bids', []))
+    ask_prices, ask_qtys = _book_side(order_book_snapshot.get('asks', []))
+    return _analyze_book(bid_prices, bid_qtys, ask_prices, ask_qtys, settings, on_status_update)
 
-    significant_bids = []
-    significant_asks = []
+def analyze_arrays(bid_prices, bid_qtys, ask_prices, ask_qtys, settings, on_status_update=None):
+    """
+    Same analysis as analyze(), for a book already held as parallel price and quantity arrays per side
+    (e.g., filled in place by a feed handler), so no [price, qty] pairs need to be built or split.
+    Returns the same dict as analyze().
+    """
+    if on_status_update:
+        on_status_update("[LiquidityAnalysisOB] Analyzing order book snapshot...")
+    return _analyze_book(np.asarray(bid_prices, dtype=np.float64), np.asarray(bid_qtys, dtype=np.float64),
+                         np.asarray(ask_prices, dtype=np.float64), np.asarray(ask_qtys, dtype=np.float64),
+                         settings, on_status_update)
 
+def _analyze_book(bid_prices, bid_qtys, ask_prices, ask_qtys, settings, on_status_update):
     # Use settings for thresholds
     qty_threshold = getattr(settings, 'LIQUIDITY_SIGNIFICANT_QTY_THRESHOLD', 10) # Default 10 BTC
-    logger.debug(f"[LiquidityAnalysisOB] Using LIQUIDITY_SIGNIFICANT_QTY_THRESHOLD: {qty_threshold}")
-
-    for price, qty in bids:
-        if qty >= qty_threshold:
-            significant_bids.append({'price': price, 'qty': qty})
-
-    for price, qty in asks:
-        if qty >= qty_threshold:
-            significant_asks.append({'price': price, 'qty': qty})
+    logger.debug("[LiquidityAnalysisOB] Using LIQUIDITY_SIGNIFICANT_QTY_THRESHOLD: %s", qty_threshold)
 
-    # Sort by quantity descending to show most significant first (optional)
-    significant_bids.sort(key=lambda x: x['qty'], reverse=True)
-    significant_asks.sort(key=lambda x: x['qty'], reverse=True)
+    # Sorted by quantity descending to show most significant first
+    significant_bid_prices, significant_bid_qtys = _significant_levels(bid_prices, bid_qtys, qty_threshold)
+    significant_ask_prices, significant_ask_qtys = _significant_levels(ask_prices, ask_qtys, qty_threshold)
+    # Dicts are only built for the levels that passed the threshold
+    significant_bids = [{'price': p, 'qty': q} for p, q in zip(significant_bid_prices.tolist(), significant_bid_qtys.tolist())]
+    significant_asks = [{'price': p, 'qty': q} for p, q in zip(significant_ask_prices.tolist(), significant_ask_qtys.tolist())]
 
     status_msg = "Order book analyzed."
     if not significant_bids and not significant_asks:
@@ -55,8 +77,8 @@ def analyze(order_book_snapshot, settings, on_status_update=None): # Added setti
          top_ask_info = f"Top Sig Ask: {significant_asks[0]['price']:.2f} Qty:{significant_asks[0]['qty']:.2f}" if significant_asks else "None"
          on_status_update(f"[LiquidityAnalysisOB] {top_bid_info} | {top_ask_info}")
 
-    logger.debug(f"[LiquidityAnalysisOB] Analysis complete. "
-               f"Found {len(significant_bids)} significant bids, {len(significant_asks)} significant asks.")
+    logger.debug("[LiquidityAnalysisOB] Analysis complete. Found %d significant bids, %d significant asks.",
+                 len(significant_bids), len(significant_asks))
     # For more detail on top levels (optional, can be verbose):
     # logger.debug(f'[LiquidityAnalysisOB] Top sig bids: {significant_bids[:3]}')
     # logger.debug(f'[LiquidityAnalysisOB] Top sig asks: {significant_asks[:3]}')
@@ -64,7 +86,10 @@ def analyze(order_book_snapshot, settings, on_status_update=None): # Added setti
         "status": status_msg,
         "significant_bids": significant_bids, # Top N can be sliced later
         "significant_asks": significant_asks,
-        "raw_snapshot_summary": f"Bids: {len(bids)} levels, Asks: {len(asks)} levels" # For debug
+        # Same levels as price arrays (same order), so S/R checks can test all of them in one comparison
+        "significant_bid_prices": significant_bid_prices,
+        "significant_ask_prices": significant_ask_prices,
+        "raw_snapshot_summary": f"Bids: {len(bid_prices)} levels, Asks: {len(ask_prices)} levels" # For debug
     }
 
 if __name__ == '__main__':
@@ -1,7 +1,7 @@
 # Placeholder for Pivot Point Analysis
+import numpy as np
 import pandas as pd
 import logging
-from datetime import datetime, time
 
 logger = logging.getLogger(__name__)
 
@@ -24,73 +24,79 @@ def calculate_standard_pivots(high, low, close):
     return {"P": P, "S1": S1, "R1": R1, "S2": S2, "R2": R2, "S3": S3, "R3": R3}
 
 
-def get_daily_pivots(historical_kline_df, on_status_update=None):
+MS_PER_DAY = 24 * 60 * 60 * 1000
+
+
+def _float_rows(column, rows):
+    """ The selected rows of a kline column (Series or array, numbers or numeric strings) as a float array. """
+    return np.asarray(pd.to_numeric(np.asarray(column)[rows]), dtype=float)
+
+
+def _processing_error(e, on_status_update):
+    logger.error(f"[PivotPointAnalysis] Error processing historical data for pivots: {e}")
+    if on_status_update:
+        on_status_update(f"[PivotPointAnalysis] Error processing data for pivots: {e}")
+    return None
+
+
+def get_daily_pivots(historical_klines, on_status_update=None):
     """
     Calculates daily pivot points based on the previous day's HLC.
-    historical_kline_df: A pandas DataFrame with 'timestamp' (ms), 'h' (high), 'l' (low), 'c' (close) columns.
+    historical_klines: Klines oldest first, with 't' (ms), 'h' (high), 'l' (low), 'c' (close) columns, either as
+                       a pandas DataFrame or as a dict of arrays (e.g. KlineRing.as_dict() views, used without copying).
     on_status_update: Callback for status messages.
     Returns: Pivot dictionary or None.
     """
-    if historical_kline_df.empty:
+    is_empty = historical_klines.empty if isinstance(historical_klines, pd.DataFrame) else not len(historical_klines.get('t', ()))
+    if is_empty:
         if on_status_update:
             on_status_update("[PivotPointAnalysis] No historical data for daily pivots.")
         return None
 
     try:
-        # Ensure data types are correct
-        historical_kline_df['h'] = pd.to_numeric(historical_kline_df['h'])
-        historical_kline_df['l'] = pd.to_numeric(historical_kline_df['l'])
-        historical_kline_df['c'] = pd.to_numeric(historical_kline_df['c'])
-        # Convert millisecond timestamp to datetime objects, ensure UTC if not specified by exchange
-        historical_kline_df['datetime'] = pd.to_datetime(historical_kline_df['t'], unit='ms', utc=True)
+        # Ensure data types are correct; the UTC day arithmetic below works on the integer ms timestamps
+        timestamps_ms = np.asarray(pd.to_numeric(historical_klines['t']), dtype=np.int64)
     except Exception as e:
-        logger.error(f"[PivotPointAnalysis] Error processing historical data for pivots: {e}")
-        if on_status_update:
-            on_status_update(f"[PivotPointAnalysis] Error processing data for pivots: {e}")
-        return None
+        return _processing_error(e, on_status_update)
 
-    # Determine today's date (UTC) based on the latest kline to find "yesterday" correctly
-    if historical_kline_df.empty:
+    if not len(timestamps_ms):
         if on_status_update: on_status_update("[PivotPointAnalysis] Kline data is empty for pivot calculation.")
         return None
 
-    latest_datetime_utc = historical_kline_df['datetime'].iloc[-1]
-    today_utc = latest_datetime_utc.date()
-
-    # Filter for previous day's klines
+    # Determine today's date (UTC) based on the latest kline to find "yesterday" correctly
     # Note: Binance daily klines typically run 00:00 to 23:59:59.999 UTC.
     # For intraday data, "previous day" means data before today 00:00 UTC.
-    previous_day_utc_start = datetime.combine(today_utc, time.min, tzinfo=latest_datetime_utc.tzinfo) - pd.Timedelta(days=1)
-    previous_day_utc_end = datetime.combine(today_utc, time.min, tzinfo=latest_datetime_utc.tzinfo) - pd.Timedelta(seconds=1) # up to 23:59:59 of previous day
+    today_start_ms = int(timestamps_ms[-1]) - int(timestamps_ms[-1]) % MS_PER_DAY
+    previous_day_start_ms = today_start_ms - MS_PER_DAY
+    previous_day_end_ms = today_start_ms - 1000 # up to 23:59:59 of previous day
 
-    prev_day_data = historical_kline_df[
-        (historical_kline_df['datetime'] >= previous_day_utc_start) &
-        (historical_kline_df['datetime'] <= previous_day_utc_end)
-    ]
+    # Klines are oldest first, so the previous day is one contiguous run of rows found by binary search
+    first_row = int(np.searchsorted(timestamps_ms, previous_day_start_ms, side='left'))
+    end_row = int(np.searchsorted(timestamps_ms, previous_day_end_ms, side='right'))
+    prev_day_rows = slice(first_row, end_row)
 
-    if prev_day_data.empty:
+    if first_row >= end_row:
         if on_status_update:
-            data_min_date_str = 'N/A'
-            data_max_date_str = 'N/A'
-            # Check if 'datetime' column exists and is not empty before trying to access min/max
-            if 'datetime' in historical_kline_df.columns and not historical_kline_df['datetime'].dropna().empty:
-                try:
-                    data_min_date_str = historical_kline_df['datetime'].min().strftime('%Y-%m-%d %H:%M:%S UTC')
-                    data_max_date_str = historical_kline_df['datetime'].max().strftime('%Y-%m-%d %H:%M:%S UTC')
-                except Exception as e_dt_format: # Catch errors during strftime if dates are weird
-                    logger.warning(f"[PivotPointAnalysis] Could not format min/max dates: {e_dt_format}")
-                    data_min_date_str = str(historical_kline_df['datetime'].min()) # Fallback to default string
-                    data_max_date_str = str(historical_kline_df['datetime'].max())
-
-            target_prev_day_str = previous_day_utc_start.strftime('%Y-%m-%d') if 'previous_day_utc_start' in locals() else 'Unknown Target Prev Day'
+            data_min_date_str = pd.Timestamp(int(timestamps_ms.min()), unit='ms', tz='UTC').strftime('%Y-%m-%d %H:%M:%S UTC')
+            data_max_date_str = pd.Timestamp(int(timestamps_ms.max()), unit='ms', tz='UTC').strftime('%Y-%m-%d %H:%M:%S UTC')
+            target_prev_day_str = pd.Timestamp(previous_day_start_ms, unit='ms', tz='UTC').strftime('%Y-%m-%d')
             msg = (f"[PivotPointAnalysis] No data for previous day ({target_prev_day_str}) "
                    f"to calculate daily pivots. Historical data available from {data_min_date_str} to {data_max_date_str}.")
             on_status_update(msg)
         return None # Return None as no prev day data
 
-    prev_day_high = prev_day_data['h'].max()
-    prev_day_low = prev_day_data['l'].min()
-    prev_day_close = prev_day_data['c'].iloc[-1] # Close of the last kline of the previous day
+    try:
+        # Only the previous day's rows are needed, so only those are converted
+        highs = _float_rows(historical_klines['h'], prev_day_rows)
+        lows = _float_rows(historical_klines['l'], prev_day_rows)
+        closes = _float_rows(historical_klines['c'], prev_day_rows)
+    except Exception as e:
+        return _processing_error(e, on_status_update)
+
+    # fmax/fmin skip NaNs like pandas' max()/min(), and only give NaN if every value is NaN
+    prev_day_high = np.fmax.reduce(highs)
+    prev_day_low = np.fmin.reduce(lows)
+    prev_day_close = closes[-1] # Close of the last kline of the previous day
 
     if pd.isna(prev_day_high) or pd.isna(prev_day_low) or pd.isna(prev_day_close):
         if on_status_update:
@@ -100,27 +106,30 @@ def get_daily_pivots(historical_kline_df, on_status_update=None):
     pivots = calculate_standard_pivots(prev_day_high, prev_day_low, prev_day_close)
 
     if pivots and on_status_update:
-        on_status_update(f"[PivotPointAnalysis] Daily Pivots (for {today_utc}, based on {previous_day_utc_start.date()}): "
+        today_utc = pd.Timestamp(today_start_ms, unit='ms', tz='UTC').date()
+        previous_day_utc = pd.Timestamp(previous_day_start_ms, unit='ms', tz='UTC').date()
+        on_status_update(f"[PivotPointAnalysis] Daily Pivots (for {today_utc}, based on {previous_day_utc}): "
                          f"P={pivots['P']:.2f}, R1={pivots['R1']:.2f}, S1={pivots['S1']:.2f}")
 
     return pivots
 
 
 # analyze_pivot_points can be a wrapper or be replaced by get_daily_pivots if only daily is needed initially.
-def analyze_pivot_points(historical_kline_df, on_status_update=None):
+def analyze_pivot_points(historical_klines, on_status_update=None):
     """
     Main analysis function for pivot points. Currently focuses on daily pivots.
+    historical_klines: DataFrame or dict of arrays, as for get_daily_pivots().
     """
     if on_status_update:
         on_status_update("[PivotPointAnalysis] Analyzing daily pivots...")
 
-    daily_pivots = get_daily_pivots(historical_kline_df, on_status_update)
+    daily_pivots = get_daily_pivots(historical_klines, on_status_update)
 
     if not daily_pivots:
         return {"status": "Failed to calculate daily pivot points."}
 
     # Further analysis could involve comparing current price to these levels, etc.
-    # current_price = float(historical_kline_df['c'].iloc[-1]) # Example
+    # current_price = float(historical_klines['c'][-1]) # Example
 
     return {"status": "Daily pivots calculated.", "daily_pivots": daily_pivots}
 
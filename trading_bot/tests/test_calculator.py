@@ -0,0 +1,89 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from trading_bot.indicators import calculator
+
+
+def _random_bars(n=120, seed=3):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    high = close + rng.uniform(0, 1, n)
+    low = close - rng.uniform(0, 1, n)
+    return pd.Series(high), pd.Series(low), pd.Series(close)
+
+
+class TestIncrementalUpdates(unittest.TestCase):
+    """Folding bars one at a time must reproduce the full-series calculate_* results."""
+
+    def setUp(self):
+        self.high, self.low, self.close = _random_bars()
+
+    def test_macd(self):
+        state = calculator.init_macd_state()
+        for close in self.close:
+            result = calculator.update_macd(state, close)
+        expected = calculator.calculate_macd(self.close)
+        for key in ('macd', 'signal', 'histogram'):
+            self.assertAlmostEqual(result[key], expected[key], places=9)
+
+    def test_macd_not_enough_data(self):
+        state = calculator.init_macd_state()
+        for close in self.close[:25]:
+            self.assertIsNone(calculator.update_macd(state, close))
+
+    def test_rsi(self):
+        state = calculator.init_rsi_state()
+        for close in self.close:
+            result = calculator.update_rsi(state, close)
+        self.assertAlmostEqual(result, calculator.calculate_rsi(self.close), places=9)
+
+    def test_atr_and_supertrend(self):
+        atr_state = calculator.init_atr_state()
+        st_state = calculator.init_supertrend_state()
+        for high, low, close in zip(self.high, self.low, self.close):
+            atr = calculator.update_atr(atr_state, high, low, close, period=14)
+            supertrend = calculator.update_supertrend(st_state, high, low, close, atr, atr_multiplier=3.0)
+        self.assertAlmostEqual(atr, calculator.calculate_atr(self.high, self.low, self.close, period=14).iloc[-1], places=9)
+        expected = calculator.calculate_supertrend(self.high, self.low, self.close, atr_period=14, atr_multiplier=3.0)
+        self.assertAlmostEqual(supertrend['last_trend'], expected['last_trend'], places=9)
+        self.assertEqual(supertrend['last_direction'], expected['last_direction'])
+
+    def test_kdj(self):
+        state = calculator.init_kdj_state()
+        highs, lows = self.high.to_numpy(), self.low.to_numpy()
+        for i, close in enumerate(self.close):
+            window = slice(max(0, i - 8), i + 1)
+            result = calculator.update_kdj(state, highs[window], lows[window], close, n_period=9)
+        expected = calculator.calculate_kdj(self.high, self.low, self.close, n_period=9)
+        for key in ('K', 'D', 'J'):
+            self.assertAlmostEqual(result[key], expected[key], places=9)
+
+    def test_sar(self):
+        state = calculator.init_sar_state()
+        for high, low in zip(self.high, self.low):
+            result = calculator.update_sar(state, high, low)
+        expected = calculator.calculate_sar(self.high, self.low)
+        self.assertAlmostEqual(result['last_sar'], expected['last_sar'], places=9)
+        self.assertEqual(result['last_direction'], expected['last_direction'])
+
+
+class TestArrayInputs(unittest.TestCase):
+    def test_momentum_from_array(self):
+        prices = np.arange(20, dtype=float) * 2
+        self.assertEqual(calculator.calculate_momentum(prices, period=10), 20.0)
+        self.assertIsNone(calculator.calculate_momentum(prices[:10], period=10))
+
+    def test_fractal_array_matches_series(self):
+        high, low, _ = _random_bars(60)
+        from_series = calculator.calculate_williams_fractal(high, low, window=5)
+        from_arrays = calculator.calculate_williams_fractal(high.to_numpy(), low.to_numpy(), window=5)
+        self.assertIsInstance(from_series['bearish'], pd.Series)
+        np.testing.assert_array_equal(from_arrays['bearish'], from_series['bearish'].to_numpy())
+        np.testing.assert_array_equal(from_arrays['bullish'], from_series['bullish'].to_numpy())
+        self.assertEqual(from_arrays['last_bullish_price'], from_series['last_bullish_price'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import unittest
+
+import numpy as np
+
+from trading_bot.strategy import fibonacci_analysis
+
+
+# (t, high, low, close) bars: swing low 100 at t=3, swing high 126 at t=5, swing low 110 at t=7
+SAMPLE_BARS = [
+    (1, 105.0, 101.0, 102.0),
+    (2, 106.0, 101.0, 102.0),
+    (3, 107.0, 100.0, 103.0),
+    (4, 125.0, 120.0, 123.0),
+    (5, 126.0, 119.0, 122.0),
+    (6, 123.0, 118.0, 121.0),
+    (7, 115.0, 110.0, 112.0),
+    (8, 116.0, 111.0, 113.0),
+    (9, 117.0, 112.0, 114.0),
+    (10, 118.0, 113.0, 115.0),
+    (11, 119.0, 114.0, 116.0),
+    (12, 120.0, 115.0, 117.0),
+    (13, 121.0, 116.0, 118.0),
+    (14, 122.0, 117.0, 119.0),
+    (15, 122.0, 117.0, 120.0),
+]
+
+
+class TestCalculateFibLevels(unittest.TestCase):
+    def test_single_swing(self):
+        levels = fibonacci_analysis.calculate_fib_levels(100.0, 126.0, fibonacci_analysis.RETRACEMENT_LEVELS)
+        self.assertIsInstance(levels, np.ndarray)
+        self.assertAlmostEqual(levels[0], 100.0)
+        self.assertAlmostEqual(levels[3], 113.0)
+        self.assertAlmostEqual(levels[-1], 126.0)
+
+    def test_batched_swings(self):
+        starts = np.array([100.0, 126.0])
+        ends = np.array([126.0, 110.0])
+        levels = fibonacci_analysis.calculate_fib_levels(starts[:, None], ends[:, None], fibonacci_analysis.RETRACEMENT_LEVELS)
+        self.assertEqual(levels.shape, (2, len(fibonacci_analysis.RETRACEMENT_LEVELS)))
+        self.assertAlmostEqual(levels[1, 3], 118.0)
+
+
+class TestRecentRetracements(unittest.TestCase):
+    def test_matrix_rows_follow_swing_pairs(self):
+        indices = np.array([1, 3, 5, 7])
+        prices = np.array([90.0, 100.0, 126.0, 110.0])
+        recent = fibonacci_analysis.recent_retracements(indices, prices, pairs=2)
+        np.testing.assert_array_equal(recent['pointA_index'], [3, 5])
+        np.testing.assert_array_equal(recent['pointB_index'], [5, 7])
+        self.assertEqual(recent['prices'].shape, (2, len(fibonacci_analysis.RETRACEMENT_LEVELS)))
+        self.assertAlmostEqual(recent['prices'][0, 3], 113.0)
+        self.assertAlmostEqual(recent['prices'][1, 3], 118.0)
+
+
+class TestFibSwingDetector(unittest.TestCase):
+    def _feed(self, bars, order=3):
+        detector = fibonacci_analysis.FibSwingDetector(order=order)
+        for t, h, l, c in bars:
+            detector.update(t, h, l, c)
+        return detector
+
+    def test_not_enough_data(self):
+        detector = self._feed(SAMPLE_BARS[:5])
+        self.assertIn("Not enough kline data", detector.analyze()["status"])
+
+    def test_last_swing_pair_and_levels(self):
+        result = self._feed(SAMPLE_BARS).analyze()
+        self.assertEqual(result["trend_type"], "downtrend")
+        self.assertEqual(result["last_swing_pointA"]["price"], 126.0)
+        self.assertEqual(result["last_swing_pointA"]["index"], 5)
+        self.assertEqual(result["last_swing_pointB"]["price"], 110.0)
+        self.assertEqual(result["last_swing_pointB"]["index"], 7)
+        self.assertEqual(result["current_price_for_context"], 120.0)
+        self.assertAlmostEqual(result["retracement_levels_A_to_B"][0.5], 118.0)
+        recent = result["recent_retracements"]
+        np.testing.assert_allclose(recent["prices"][-1], list(result["retracement_levels_A_to_B"].values()))
+        self.assertEqual(recent["pointB_index"][-1], 7)
+
+    def test_levels_reused_until_swing_pair_changes(self):
+        detector = self._feed(SAMPLE_BARS)
+        first = detector.analyze()["retracement_levels_A_to_B"]
+        detector.update(16, 121.0, 116.0, 119.0)
+        self.assertIs(detector.analyze()["retracement_levels_A_to_B"], first)
+        for t, h, l, c in [(17, 140.0, 120.0, 139.0), (18, 130.0, 121.0, 125.0), (19, 129.0, 122.0, 124.0), (20, 128.0, 123.0, 124.0)]:
+            detector.update(t, h, l, c)
+        result = detector.analyze()
+        self.assertEqual(result["last_swing_pointB"]["price"], 140.0)
+        self.assertIsNot(result["retracement_levels_A_to_B"], first)
+        self.assertAlmostEqual(result["retracement_levels_A_to_B"][1.0], 140.0)
+
+    def test_flat_top_counts_once(self):
+        # Three equal highs in a row: the middle bar must not open a second swing
+        bars = [(i, h, h - 1.0, h) for i, h in enumerate([1, 2, 3, 5, 5, 5, 3, 2, 1, 2, 3])]
+        detector = self._feed(bars, order=2)
+        highs = [s for s in detector._swings if s['type'] == 'high']
+        self.assertEqual(len(highs), 1)
+        self.assertEqual(highs[0]['index'], 3)
+
+    def test_matches_batch_analyze(self):
+        # Same bars through the batch and streaming paths, including rounded prices with equal neighbours
+        rng = np.random.default_rng(5)
+        for _ in range(50):
+            n = int(rng.integers(10, 120))
+            close = np.round(100 + np.cumsum(rng.normal(0, 1, n)))
+            high = close + np.round(rng.uniform(0, 1, n), 1)
+            low = close - np.round(rng.uniform(0, 1, n), 1)
+            bars = [(1000 + i, float(high[i]), float(low[i]), float(close[i])) for i in range(n)]
+            expected = fibonacci_analysis.analyze([{'t': t, 'h': h, 'l': l, 'c': c} for t, h, l, c in bars])
+            result = self._feed(bars).analyze()
+            self.assertEqual(result["status"], expected["status"])
+            if "last_swing_pointA" not in expected:
+                continue
+            for key in ("last_swing_pointA", "last_swing_pointB", "trend_type", "retracement_levels_A_to_B", "current_price_for_context"):
+                self.assertEqual(result[key], expected[key])
+            for key, value in expected["recent_retracements"].items():
+                np.testing.assert_array_equal(result["recent_retracements"][key], value)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,304 @@
+import sys
+import threading
+import unittest
+
+from trading_bot.strategy import gold_strategy, liquidity_analysis
+from trading_bot.utils import settings
+
+
+class TestScoreConsolidation(unittest.TestCase):
+    def test_all_long_states(self):
+        long_perc, short_perc = gold_strategy.score_consolidation(
+            'STRONG_BULLISH_TREND', 'STRONG_BULLISH', 'BULLISH', 'OVERSOLD',
+            'BROKE_BEARISH_FRACTAL_UP', 'BOUNCE_SUPPORT_PIVOT', 'HIGH_VOLUME')
+        self.assertAlmostEqual(long_perc, 100.0)
+        self.assertAlmostEqual(short_perc, 2 / 11 * 100) # Volume counts for both sides
+
+    def test_mixed_states(self):
+        long_perc, short_perc = gold_strategy.score_consolidation(
+            'BEARISH_TREND_ST', 'STRONG_BULLISH', 'BULLISH', 'BEARISH',
+            'NEUTRAL', 'NEUTRAL_SR', 'AVERAGE_VOLUME')
+        self.assertAlmostEqual(long_perc, 4 / 11 * 100)
+        self.assertAlmostEqual(short_perc, 3 / 11 * 100)
+
+    def test_neutral_states(self):
+        self.assertEqual(gold_strategy.score_consolidation(
+            'NEUTRAL_TREND', 'NEUTRAL', 'NEUTRAL', 'NEUTRAL', 'NEUTRAL', 'NEUTRAL_SR', 'LOW_VOLUME'), (0.0, 0.0))
+
+
+class TestLiquidityLevels(unittest.TestCase):
+    def setUp(self):
+        self.strategy = gold_strategy.GoldenStrategy()
+        order_book = {'bids': [[99.0, 50.0], [97.0, 40.0], [99.9, 30.0]], 'asks': [[101.0, 50.0], [100.5, 40.0]]}
+        self.zones = liquidity_analysis.analyze(order_book, settings)
+
+    def test_checks_top_levels_with_price_arrays(self):
+        self.assertEqual(self.zones['significant_bid_prices'].tolist(), [99.0, 97.0, 99.9])
+        # Bar dips to the second-ranked bid (97.0) and closes above it
+        self.assertEqual(self.strategy._assess_sr_levels(98.0, 96.95, 98.5, None, None, self.zones), 'BOUNCE_SUPPORT_LIQ')
+        # The third-ranked bid is beyond LIQUIDITY_LEVELS_TO_CHECK
+        self.assertEqual(self.strategy._assess_sr_levels(100.0, 99.85, 100.05, None, None, self.zones), 'NEUTRAL_SR')
+        self.assertEqual(self.strategy._assess_sr_levels(100.05, 99.95, 100.3, None, None, self.zones), 'REJECT_RESISTANCE_LIQ')
+
+    def test_levels_without_price_arrays(self):
+        zones = {'significant_bids': self.zones['significant_bids'], 'significant_asks': self.zones['significant_asks']}
+        self.assertEqual(self.strategy._assess_sr_levels(98.0, 96.95, 98.5, None, None, zones), 'BOUNCE_SUPPORT_LIQ')
+
+    def test_order_book_update_stores_analysis(self):
+        updates = []
+        self.strategy.on_liquidity_update_callback = updates.append
+        order_book = {'bids': [[99.0, 50.0]], 'asks': [[101.0, 50.0]]}
+        with self.assertLogs(gold_strategy.logger, level='DEBUG'): # Debug summaries are built when enabled
+            self.strategy.process_order_book_update(order_book)
+        self.assertIs(self.strategy.latest_order_book_snapshot, order_book)
+        self.assertEqual(updates, [self.strategy.latest_liquidity_analysis])
+        self.assertEqual(self.strategy.latest_liquidity_analysis['significant_bid_prices'].tolist(), [99.0])
+
+
+def _sample_klines(n=3000, start_ms=1672531200000):
+    klines = []
+    price = 100.0
+    for i in range(n):
+        close = price + ((i * 7) % 11 - 5) * 0.1
+        klines.append({'t': str(start_ms + i * 60000), 'o': str(price), 'h': str(max(price, close) + 0.2),
+                       'l': str(min(price, close) - 0.2), 'c': str(close), 'v': '1.5'})
+        price = close
+    return klines
+
+
+class TestAggregation(unittest.TestCase):
+    def _kline(self, minute, o, h, l, c, v=1.0, start_ms=1672531200000):
+        return {'t': str(start_ms + minute * 60000), 'o': str(o), 'h': str(h), 'l': str(l), 'c': str(c), 'v': str(v)}
+
+    def test_bar_ohlcv_from_running_accumulators(self):
+        strategy = gold_strategy.GoldenStrategy()
+        strategy.process_batch([
+            self._kline(0, 10, 12, 9, 11), self._kline(30, 11, 15, 10, 14, 2.0), self._kline(59, 14, 14, 8, 9),
+            self._kline(60, 9, 10, 9, 10)
+        ])
+        self.assertEqual(len(strategy.agg_klines), 1)
+        self.assertEqual(strategy.agg_klines.values()[:, 0].tolist(), [10, 15, 8, 9, 4.0])
+        self.assertEqual(strategy._cur_bar_start_ms, 1672531200000 + 3600000)
+
+    def test_late_kline_for_finalized_bar_is_ignored(self):
+        strategy = gold_strategy.GoldenStrategy()
+        strategy.process_batch([self._kline(0, 10, 12, 9, 11), self._kline(60, 9, 10, 9, 10), self._kline(5, 1, 100, 0.5, 1)])
+        self.assertEqual(strategy.agg_klines.values()[:, 0].tolist(), [10, 12, 9, 11, 1.0])
+        self.assertEqual((strategy._cur_high, strategy._cur_low, strategy._cur_close), (10, 9, 10))
+
+
+class TestProcessBatch(unittest.TestCase):
+    def test_matches_per_kline_historical_fill(self):
+        klines = _sample_klines()
+        per_kline = gold_strategy.GoldenStrategy()
+        per_kline.is_historical_fill_active = True
+        for kline in klines:
+            per_kline.process_new_kline(kline)
+
+        batched = gold_strategy.GoldenStrategy()
+        self.assertEqual(batched.process_batch(klines[:1250]) + batched.process_batch(klines[1250:]), len(klines))
+        self.assertFalse(batched.is_historical_fill_active)
+        self.assertEqual(batched.agg_klines.values().tolist(), per_kline.agg_klines.values().tolist())
+        self.assertIsNotNone(batched.latest_indicators['macd'])
+        self.assertEqual(batched.latest_indicators, per_kline.latest_indicators)
+
+    def test_out_of_order_klines_match_per_kline_replay(self):
+        klines = _sample_klines(600)
+        klines[100], klines[130] = klines[130], klines[100] # Late kline inside one bar
+        klines.insert(400, klines[50]) # Late kline for an already finalized bar
+        per_kline = gold_strategy.GoldenStrategy()
+        per_kline.is_historical_fill_active = True
+        for kline in klines:
+            per_kline.process_new_kline(kline)
+
+        batched = gold_strategy.GoldenStrategy()
+        batched.process_batch(klines[:250])
+        batched.process_batch(iter(klines[250:]))
+        self.assertEqual(batched.agg_klines.values().tolist(), per_kline.agg_klines.values().tolist())
+        self.assertEqual(batched.raw_klines.values().tolist(), per_kline.raw_klines.values().tolist())
+        self.assertEqual((batched._cur_bar_start_ms, batched._cur_volume), (per_kline._cur_bar_start_ms, per_kline._cur_volume))
+
+    def test_invalid_kline_is_skipped(self):
+        klines = _sample_klines(180)
+        del klines[90]['v']
+        strategy = gold_strategy.GoldenStrategy()
+        with self.assertLogs(gold_strategy.logger, level='ERROR'):
+            self.assertEqual(strategy.process_batch(klines), 180)
+        self.assertEqual(len(strategy.agg_klines), 2)
+        self.assertEqual(strategy.agg_klines.values()[4, 1], 59 * 1.5)
+
+    def test_no_status_messages_during_fill(self):
+        messages = []
+        strategy = gold_strategy.GoldenStrategy(on_status_update=messages.append)
+        del messages[:] # Initialization message
+        strategy.process_batch(_sample_klines(300))
+        self.assertEqual(messages, [])
+        strategy.process_new_kline(_sample_klines(301)[-1])
+        self.assertTrue(any('New 1H bar' in message for message in messages))
+
+
+class TestGenerateSignal(unittest.TestCase):
+    def test_returns_signal_tuple(self):
+        strategy = gold_strategy.GoldenStrategy(on_signal_update=lambda message: None)
+        strategy.process_batch(_sample_klines())
+        results = []
+        generate_signal = strategy._generate_signal
+        strategy._generate_signal = lambda **kwargs: results.append(generate_signal(**kwargs)) or results[-1]
+        strategy._run_strategy_on_aggregated_data()
+
+        signal, = results
+        self.assertIsInstance(signal, gold_strategy.Signal)
+        self.assertEqual(signal.type, 'CONSOLIDATION_INFO')
+        self.assertIsNone(signal.tp) # Trade-only fields stay unset
+        self.assertAlmostEqual(signal.long_perc, 3 / 11 * 100)
+        self.assertEqual(signal.debug_states['volume'], 'AVERAGE_VOLUME')
+
+    def test_skipped_without_signal_or_status_callbacks(self):
+        indicators = []
+        strategy = gold_strategy.GoldenStrategy(on_indicators_update=indicators.append)
+        strategy.process_batch(_sample_klines())
+        strategy._generate_signal = lambda **kwargs: self.fail("Signal generated with nobody subscribed")
+        strategy._run_strategy_on_aggregated_data()
+        self.assertEqual(indicators[-1]['timeframe'], '1H') # Indicator panel is still updated
+
+
+class _FinalizeGatedStrategy(gold_strategy.GoldenStrategy):
+    """ Pauses a bar's finalization when it reads the fill flag to decide whether the worker takes the bar. """
+
+    def __init__(self, *args, **kwargs):
+        self.gate_armed = False
+        self.gate_entered, self.gate_release = threading.Event(), threading.Event()
+        super().__init__(*args, **kwargs)
+
+    @property
+    def is_historical_fill_active(self):
+        if self.gate_armed and sys._getframe(1).f_code.co_name == '_finalize_and_process_aggregated_bar':
+            self.gate_armed = False
+            self.gate_entered.set()
+            self.gate_release.wait(10)
+        return self._fill_active
+
+    @is_historical_fill_active.setter
+    def is_historical_fill_active(self, value):
+        self._fill_active = value
+
+
+class TestSignalWorker(unittest.TestCase):
+    def test_worker_publishes_same_final_signal_as_inline(self):
+        klines = _sample_klines()
+        inline_signals, worker_signals = [], []
+        inline = gold_strategy.GoldenStrategy(on_signal_update=inline_signals.append)
+        for kline in klines:
+            inline.process_new_kline(kline)
+
+        threaded = gold_strategy.GoldenStrategy(on_signal_update=worker_signals.append)
+        threaded.start_signal_worker()
+        for kline in klines:
+            threaded.process_new_kline(kline)
+        threaded.stop_signal_worker(timeout=10)
+
+        self.assertIsNone(threaded._signal_worker)
+        self.assertTrue(worker_signals)
+        self.assertLessEqual(len(worker_signals), len(inline_signals)) # Bursts may be coalesced
+        self.assertEqual(worker_signals[-1], inline_signals[-1])
+
+
+    def test_stop_analyses_bar_finalized_during_compute(self):
+        klines = _sample_klines(121) # Minute klines: 60 complete the first 1H bar, 60 more the second
+        strategy = gold_strategy.GoldenStrategy()
+        entered, release = threading.Event(), threading.Event()
+        analysed_bar_counts = []
+        compute_and_emit = strategy._compute_and_emit
+        def gated_compute_and_emit():
+            analysed_bar_counts.append(len(strategy.agg_klines))
+            entered.set()
+            release.wait(10)
+            compute_and_emit()
+        strategy._compute_and_emit = gated_compute_and_emit
+
+        strategy.start_signal_worker()
+        for kline in klines[:61]:
+            strategy.process_new_kline(kline)
+        self.assertTrue(entered.wait(10)) # First bar is being analysed
+        for kline in klines[61:]:
+            strategy.process_new_kline(kline) # Second bar is finalized meanwhile
+        self.assertTrue(strategy._analysis_pending)
+
+        stopper = threading.Thread(target=strategy.stop_signal_worker, kwargs={'timeout': 10})
+        stopper.start()
+        while not strategy._signal_worker_stopping:
+            stopper.join(0.001)
+        release.set() # Stop was requested while the first run was still busy
+        stopper.join(10)
+
+        self.assertIsNone(strategy._signal_worker)
+        self.assertEqual(analysed_bar_counts, [1, 2])
+        self.assertFalse(strategy._analysis_pending)
+
+    def test_stop_during_bar_finalization_analyses_the_bar(self):
+        klines = _sample_klines(61)
+        strategy = _FinalizeGatedStrategy()
+        analysed_bar_counts = []
+        compute_and_emit = strategy._compute_and_emit
+        strategy._compute_and_emit = lambda: analysed_bar_counts.append(len(strategy.agg_klines)) or compute_and_emit()
+        strategy.start_signal_worker()
+        for kline in klines[:60]:
+            strategy.process_new_kline(kline)
+
+        strategy.gate_armed = True
+        ingest = threading.Thread(target=strategy.process_new_kline, args=(klines[60],)) # Completes the first bar
+        ingest.start()
+        self.assertTrue(strategy.gate_entered.wait(10)) # Deciding whether the worker takes the bar
+        stopper = threading.Thread(target=strategy.stop_signal_worker, kwargs={'timeout': 10})
+        stopper.start()
+        # Let the stop run as far as it can while the ingest thread is held: unguarded, it would
+        # finish here and the bar flagged afterwards would never be analysed
+        stopper.join(0.2)
+        strategy.gate_release.set()
+        ingest.join(10)
+        stopper.join(10)
+
+        self.assertIsNone(strategy._signal_worker)
+        self.assertEqual(analysed_bar_counts, [1])
+        self.assertFalse(strategy._analysis_pending)
+
+    def test_stop_timeout_keeps_busy_worker_registered(self):
+        klines = _sample_klines(61)
+        strategy = gold_strategy.GoldenStrategy()
+        entered, release = threading.Event(), threading.Event()
+        compute_and_emit = strategy._compute_and_emit
+        def gated_compute_and_emit():
+            entered.set()
+            release.wait(10)
+            compute_and_emit()
+        strategy._compute_and_emit = gated_compute_and_emit
+        strategy.start_signal_worker()
+        worker = strategy._signal_worker
+        for kline in klines:
+            strategy.process_new_kline(kline)
+        self.assertTrue(entered.wait(10))
+
+        with self.assertLogs(gold_strategy.logger, level='WARNING'):
+            strategy.stop_signal_worker(timeout=0.01)
+        self.assertIs(strategy._signal_worker, worker) # Still running, so still the registered worker
+        strategy.start_signal_worker()
+        self.assertIs(strategy._signal_worker, worker) # Restart resumes it instead of starting a second loop
+        self.assertFalse(strategy._signal_worker_stopping)
+
+        release.set()
+        strategy.stop_signal_worker(timeout=10)
+        self.assertFalse(worker.is_alive())
+        self.assertIsNone(strategy._signal_worker)
+
+    def test_chart_updates_stay_on_ingest_thread(self):
+        chart_threads = []
+        strategy = gold_strategy.GoldenStrategy(on_chart_update=lambda df: chart_threads.append(threading.current_thread()))
+        strategy.start_signal_worker()
+        for kline in _sample_klines(300): # Warm-up bars, whose analysis also refreshes the chart when run inline
+            strategy.process_new_kline(kline)
+        strategy.stop_signal_worker(timeout=10)
+        self.assertEqual(len(chart_threads), 300)
+        self.assertEqual(set(chart_threads), {threading.current_thread()})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+
+import numpy as np
+
+from trading_bot.utils.kline_ring import KlineRing
+
+
+class TestKlineRing(unittest.TestCase):
+    def _fill(self, ring, count):
+        for i in range(count):
+            ring.append(1000 * i, i, i + 0.5, i - 0.5, i + 0.25, 10 * i)
+
+    def test_partial_fill_is_time_ordered(self):
+        ring = KlineRing(5)
+        self._fill(ring, 3)
+        self.assertEqual(len(ring), 3)
+        np.testing.assert_array_equal(ring.timestamps(), [0, 1000, 2000])
+        np.testing.assert_array_equal(ring.column('o'), [0, 1, 2])
+        self.assertEqual(ring.last('c'), 2.25)
+
+    def test_wraparound_keeps_newest_contiguous(self):
+        ring = KlineRing(4)
+        self._fill(ring, 11)
+        self.assertEqual(len(ring), 4)
+        np.testing.assert_array_equal(ring.timestamps(), [7000, 8000, 9000, 10000])
+        np.testing.assert_array_equal(ring.column('h'), [7.5, 8.5, 9.5, 10.5])
+        self.assertEqual(ring.values().shape, (5, 4))
+        self.assertEqual(ring.last('v'), 100)
+
+    def test_views_share_memory(self):
+        ring = KlineRing(3)
+        self._fill(ring, 5)
+        self.assertTrue(np.shares_memory(ring.column('c'), ring.values()))
+
+    def test_float32_values_keep_exact_timestamps(self):
+        ring = KlineRing(3, dtype=np.float32)
+        ring.append(1672531200000, 1.0, 2.0, 0.5, 1.5, 3.0)
+        self.assertEqual(ring.values().dtype, np.float32)
+        self.assertEqual(int(ring.timestamps()[-1]), 1672531200000)
+
+    def test_empty_last_raises(self):
+        with self.assertRaises(IndexError):
+            KlineRing(2).last('c')
+
+
+if __name__ == '__main__':
+    unittest.main()
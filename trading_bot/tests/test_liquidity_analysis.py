@@ -0,0 +1,42 @@
+import types
+import unittest
+
+import numpy as np
+
+from trading_bot.strategy import liquidity_analysis
+
+
+class TestAnalyze(unittest.TestCase):
+    def setUp(self):
+        self.settings = types.SimpleNamespace(LIQUIDITY_SIGNIFICANT_QTY_THRESHOLD=5.0)
+
+    def test_matches_per_level_filter_and_sort(self):
+        rng = np.random.default_rng(11)
+        bids = [[30000.0 - i * 0.5, float(q)] for i, q in enumerate(rng.integers(0, 12, 1000))] # Many equal quantities
+        asks = [[30000.5 + i * 0.5, float(q)] for i, q in enumerate(rng.integers(0, 12, 1000))]
+        result = liquidity_analysis.analyze({'bids': bids, 'asks': asks}, self.settings)
+
+        for levels, key in ((bids, 'significant_bids'), (asks, 'significant_asks')):
+            expected = sorted(({'price': p, 'qty': q} for p, q in levels if q >= 5.0), key=lambda x: x['qty'], reverse=True)
+            self.assertEqual(result[key], expected)
+        self.assertEqual(result['significant_bid_prices'].tolist(), [level['price'] for level in result['significant_bids']])
+        self.assertIs(type(result['significant_asks'][0]['qty']), float)
+
+    def test_arrays_match_snapshot(self):
+        bids, asks = [[99.0, 6.0], [98.5, 20.0], [98.0, 1.0]], [[101.0, 5.0], [101.5, 2.0]]
+        expected = liquidity_analysis.analyze({'bids': bids, 'asks': asks}, self.settings)
+        result = liquidity_analysis.analyze_arrays(
+            np.array([99.0, 98.5, 98.0]), np.array([6.0, 20.0, 1.0]), [101.0, 101.5], [5.0, 2.0], self.settings)
+        self.assertEqual(result['significant_bids'], expected['significant_bids'])
+        self.assertEqual(result['significant_asks'], [{'price': 101.0, 'qty': 5.0}])
+        self.assertEqual(result['raw_snapshot_summary'], expected['raw_snapshot_summary'])
+
+    def test_empty_book(self):
+        result = liquidity_analysis.analyze({'bids': [], 'asks': []}, self.settings)
+        self.assertEqual((result['significant_bids'], result['significant_asks']), ([], []))
+        self.assertEqual(result['significant_ask_prices'].shape, (0,))
+        self.assertEqual(result['status'], "Order book analyzed. No liquidity levels found exceeding threshold.")
+
+
+if __name__ == '__main__':
+    unittest.main()
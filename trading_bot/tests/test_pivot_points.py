@@ -0,0 +1,56 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from trading_bot.strategy import pivot_points
+
+
+def _ms(timestamp):
+    return pd.Timestamp(timestamp, tz='UTC').value // 10**6
+
+
+class TestDailyPivots(unittest.TestCase):
+    def setUp(self):
+        self.klines = pd.DataFrame([
+            {'t': _ms('2023-01-01 01:00:00'), 'h': 110.0, 'l': 90.0, 'c': 105.0},
+            {'t': _ms('2023-01-01 12:00:00'), 'h': 118.0, 'l': 102.0, 'c': 115.0},
+            {'t': _ms('2023-01-01 23:59:00'), 'h': 117.0, 'l': 88.0, 'c': 110.0},
+            {'t': _ms('2023-01-02 00:30:00'), 'h': 112.0, 'l': 108.0, 'c': 111.0},
+        ])
+
+    def test_previous_day_hlc(self):
+        pivots = pivot_points.get_daily_pivots(self.klines)
+        self.assertAlmostEqual(pivots['P'], (118 + 88 + 110) / 3)
+        self.assertAlmostEqual(pivots['S1'], 2 * pivots['P'] - 118)
+
+    def test_dict_of_arrays_matches_dataframe(self):
+        columns = {name: self.klines[name].to_numpy() for name in self.klines.columns}
+        self.assertEqual(pivot_points.get_daily_pivots(columns), pivot_points.get_daily_pivots(self.klines))
+
+    def test_string_columns_only_previous_day_converted(self):
+        raw = self.klines.astype(str)
+        raw.loc[3, 'h'] = 'n/a' # Today's row is not needed for the pivots
+        pivots = pivot_points.get_daily_pivots(raw)
+        self.assertAlmostEqual(pivots['P'], (118 + 88 + 110) / 3)
+
+        raw.loc[1, 'h'] = 'n/a'
+        messages = []
+        self.assertIsNone(pivot_points.get_daily_pivots(raw, messages.append))
+        self.assertTrue(messages[-1].startswith("[PivotPointAnalysis] Error processing data for pivots:"))
+
+    def test_no_previous_day(self):
+        messages = []
+        columns = {'t': np.array([_ms('2023-01-01 01:00:00')]), 'h': np.array([1.0]), 'l': np.array([0.5]), 'c': np.array([0.7])}
+        self.assertIsNone(pivot_points.get_daily_pivots(columns, messages.append))
+        self.assertIn("No data for previous day (2022-12-31)", messages[-1])
+
+    def test_empty_input(self):
+        messages = []
+        empty = {'t': np.array([], dtype=np.int64), 'h': np.array([]), 'l': np.array([]), 'c': np.array([])}
+        self.assertIsNone(pivot_points.get_daily_pivots(empty, messages.append))
+        self.assertEqual(messages, ["[PivotPointAnalysis] No historical data for daily pivots."])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+# trading_bot/utils/kline_ring.py
+
+import numpy as np
+
+
+class KlineRing:
+    """
+    Fixed-capacity ring buffer of klines stored column-wise (one NumPy row per field)
+    plus an int64 timestamp array, replacing deques of per-kline dicts.
+
+    Every kline is written twice, at `head` and `head + capacity`, so the newest
+    len(ring) klines are always one contiguous slice in time order. Reads are therefore
+    zero-copy views: no np.roll, no concatenate, no dict lookups.
+    Views are only valid until the next append.
+    """
+    FIELDS = ('o', 'h', 'l', 'c', 'v')
+    _FIELD_ROW = {name: row for row, name in enumerate(FIELDS)}
+
+    def __init__(self, capacity, dtype=np.float64):
+        if capacity <= 0:
+            raise ValueError("KlineRing capacity must be positive.")
+        self.capacity = capacity
+        self._values = np.zeros((len(self.FIELDS), 2 * capacity), dtype=dtype)
+        self._ts = np.zeros(2 * capacity, dtype=np.int64)
+        self._head = 0 # Next write position, in [0, capacity)
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def append(self, t, o, h, l, c, v):
+        """Adds one kline, overwriting the oldest once the ring is full."""
+        head = self._head
+        mirror = head + self.capacity
+        self._ts[head] = self._ts[mirror] = t
+        self._values[:, head] = self._values[:, mirror] = (o, h, l, c, v)
+        self._head = head + 1 if head + 1 < self.capacity else 0
+        if self._count < self.capacity:
+            self._count += 1
+
+    def clear(self):
+        self._head = 0
+        self._count = 0
+
+    def _window(self):
+        start = self._head if self._count == self.capacity else 0
+        return start, start + self._count
+
+    def column(self, field):
+        """Time-ordered view of one field ('o', 'h', 'l', 'c' or 'v')."""
+        start, end = self._window()
+        return self._values[self._FIELD_ROW[field], start:end]
+
+    def timestamps(self):
+        """Time-ordered view of the kline open times (ms)."""
+        start, end = self._window()
+        return self._ts[start:end]
+
+    def values(self):
+        """Time-ordered (5, len) view of all fields, rows in FIELDS order."""
+        start, end = self._window()
+        return self._values[:, start:end]
+
+    def as_dict(self):
+        """{'t': timestamps, 'o': ..., 'v': ...} of time-ordered views, e.g. for pd.DataFrame(..., copy=False)."""
+        start, end = self._window()
+        columns = {'t': self._ts[start:end]}
+        for row, name in enumerate(self.FIELDS):
+            columns[name] = self._values[row, start:end]
+        return columns
+
+    def last(self, field):
+        """Value of `field` for the newest kline."""
+        if not self._count:
+            raise IndexError("KlineRing is empty.")
+        last_pos = (self._head - 1) % self.capacity
+        return self._values[self._FIELD_ROW[field], last_pos]
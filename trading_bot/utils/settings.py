@@ -53,6 +53,7 @@ SAR_AF_INCREMENT = 0.02
 FRACTAL_WINDOW = 5
 MOMENTUM_PERIOD = 10
 ATR_PERIOD = 14 # General ATR period, used by Supertrend and can be used for TP/SL
+INDICATOR_FULL_RECALC_INTERVAL = 500 # Aggregated bars between full rebuilds of the incrementally updated indicator states
 
 # Strategy Parameters
 STRATEGY_RSI_OVERSOLD = 30
@@ -71,6 +72,7 @@ KDJ_J_OVERSOLD = 10.0
 KDJ_K_CONFIRM_OVERBOUGHT = 80.0 # K value to confirm J's overbought
 KDJ_K_CONFIRM_OVERSOLD = 20.0 # K value to confirm J's oversold
 SR_PROXIMITY_FACTOR = 0.003 # 0.3% proximity to S/R levels for bounce/rejection
+FIB_RECENT_SWING_PAIRS = 5 # Latest swing pairs whose retracements are returned together (for confluence checks)
 VOLUME_AVG_PERIOD = 20 # Rolling average period for volume assessment
 VOLUME_HIGH_MULTIPLIER = 1.5 # Volume > X * average
 VOLUME_LOW_MULTIPLIER = 0.7  # Volume < X * average
@@ -81,6 +83,10 @@ SL_PRICE_BUFFER_ATR_FACTOR = 0.1 # Factor of ATR to use as a buffer for SL place
 # Note: 'T' is pandas offset alias for minute. Use 'min' for pd.Timedelta, e.g. '1min', '60min'
 STRATEGY_TIMEFRAME = "1H"
 
+# Run bar analysis and signal generation on a worker thread, so kline ingest never waits on it.
+# Bars finalized while the worker is busy are coalesced: only the newest one is analysed.
+STRATEGY_COMPUTE_THREAD = False
+
 # Interval for DataFetcher to fetch klines (e.g., '1m', '5m', '1h') - must match Binance API options for websockets and historical data
 KLINE_FETCH_INTERVAL = "1m"
 